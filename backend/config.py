@@ -60,3 +60,9 @@ def set_config_for_test(**kwargs):
     """For testing only: override the AppConfig instance with new values."""
     global _config
     _config = AppConfig(**kwargs)
+
+
+def reset_config_for_test():
+    """For testing only: drop any override so get_config() reloads from the environment."""
+    global _config
+    _config = None
@@ -1,8 +1,12 @@
 "Utilities to work with volumes and files within the databricks workspace."
+import io
 import os
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from functools import cached_property
+from typing import BinaryIO, Iterator, Optional, Union
+from pydantic import ConfigDict
+from pydantic.dataclasses import dataclass
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import NotFound
 
 from backend.databricks.auth import get_databricks_auth
 from backend.config import get_config
@@ -12,30 +16,41 @@ from backend.exceptions import FileAlreadyExistsError, FileNotFoundError, Volume
 logger = get_logger(__name__)
 
 
-class Volume(BaseModel):
+@dataclass(frozen=True, config=ConfigDict(extra='forbid'))
+class Volume:
     """Represents a Databricks volume identity (catalog, schema, name).
 
-    This is a pure pydantic model that contains only the logical identity
+    This is a frozen pydantic dataclass that contains only the logical identity
     of a volume and can construct volume-based URIs. It does not perform
-    any I/O operations or interact with the Databricks API.
+    any I/O operations or interact with the Databricks API. Since the identity
+    cannot change, the derived names are computed once and cached.
     """
-    model_config = ConfigDict(extra='forbid')
 
     catalog: str
     schema_name: str
     volume_name: str
 
+    @cached_property
+    def full_name(self) -> str:
+        """The full volume name in format: catalog.schema.volume_name"""
+        return f"{self.catalog}.{self.schema_name}.{self.volume_name}"
+
+    @cached_property
+    def volume_path(self) -> str:
+        """The volume path in format: /Volumes/catalog/schema/volume_name"""
+        return f"/Volumes/{self.catalog}/{self.schema_name}/{self.volume_name}"
+
     def get_full_name(self) -> str:
         """Return the full volume name in format: catalog.schema.volume_name"""
-        return f"{self.catalog}.{self.schema_name}.{self.volume_name}"
+        return self.full_name
 
     def get_volume_path(self) -> str:
         """Return the volume path in format: /Volumes/catalog/schema/volume_name"""
-        return f"/Volumes/{self.catalog}/{self.schema_name}/{self.volume_name}"
+        return self.volume_path
 
     def get_file_path(self, file_name: str) -> str:
         """Return the full file path for a given file name within this volume."""
-        return f"{self.get_volume_path()}/{file_name}"
+        return f"{self.volume_path}/{file_name}"
 
 
 class VolumeFileStore:
@@ -57,41 +72,70 @@ class VolumeFileStore:
         self.client = client
 
     def volume_exists(self) -> bool:
-        """Checks if the volume exists in the databricks workspace."""
+        """Checks if the volume exists in the databricks workspace.
+
+        Only a NotFound response means the volume is missing; auth, network and
+        other SDK errors propagate rather than being reported as a missing volume.
+        """
         full_name = self.volume.get_full_name()
         try:
             self.client.volumes.read(name=full_name)
             return True
-        except Exception as e:
-            logger.warning(f"Volume {full_name} does not exist or cannot be accessed: {e}")
+        except NotFound as e:
+            logger.warning(f"Volume {full_name} does not exist: {e}")
             return False
 
+    def list_files_iter(self) -> Iterator[str]:
+        """Lazily yields the paths of the files in the volume.
+
+        Entries are pulled from the Files API listing as the caller iterates, so
+        only the current page of results is held in memory. Unlike list_files,
+        listing errors propagate to the caller.
+        """
+        for item in self.client.files.list_directory_contents(self.volume.get_volume_path()):
+            yield item.path
+
     def list_files(self) -> list[str]:
         """Lists the files in the volume."""
-        volume_path = self.volume.get_volume_path()
         try:
-            files = self.client.files.list_directory_contents(volume_path)
-            return [item.path for item in files]
+            return list(self.list_files_iter())
         except Exception as e:
             logger.error(f"Failed to list files in volume {self.volume.volume_name}: {e}")
             return []
 
     def file_exists(self, file_name: str) -> bool:
-        """Checks if a file exists in the volume using Files API get_metadata."""
+        """Checks if a file exists in the volume using Files API get_metadata.
+
+        Only a NotFound response means the file is missing; other SDK errors propagate.
+        """
         file_path = self.volume.get_file_path(file_name)
         try:
             self.client.files.get_metadata(file_path)
             return True
-        except Exception:
+        except NotFound:
             return False
 
-    def upload_file(self, file_path: str, overwrite: bool = False, destination_filename: Optional[str] = None) -> bool:
-        """Uploads a file to the volume using Files API upload.
+    def _exists_for_upload(self, file_name: str, assume_exists: Optional[bool]) -> bool:
+        """Return whether file_name exists, trusting a caller-supplied answer when given."""
+        if assume_exists is not None:
+            return assume_exists
+        return self.file_exists(file_name)
+
+    def upload_file(
+        self,
+        file_path: str,
+        overwrite: bool = False,
+        destination_filename: Optional[str] = None,
+        assume_exists: Optional[bool] = None,
+    ) -> bool:
+        """Uploads a local file to the volume using the Files API, in parallel parts for large files.
 
         Args:
             file_path: Path to the local file to upload
             overwrite: Whether to overwrite existing files
             destination_filename: Optional filename to use in the volume. If not provided, uses the basename of file_path.
+            assume_exists: Whether the destination is already known to exist, e.g. from a
+                prior list_files call. When given, the per-file existence lookup is skipped.
 
         Returns:
             True if upload was successful
@@ -108,18 +152,61 @@ class VolumeFileStore:
         file_name = destination_filename if destination_filename is not None else os.path.basename(file_path)
         volume_file_path = self.volume.get_file_path(file_name)
 
-        if self.file_exists(file_name) and not overwrite:
+        if not overwrite and self._exists_for_upload(file_name, assume_exists):
             logger.error(f"File {file_name} already exists in volume {self.volume.volume_name} and overwrite is False.")
             raise FileAlreadyExistsError(file_name, self.volume.volume_name)
 
         try:
-            with open(file_path, "rb") as f:
-                self.client.files.upload(volume_file_path, f, overwrite=overwrite)
+            # upload_from reads the local file itself and, for large files, sends it as a
+            # multipart upload with parts read and sent on parallel threads
+            self.client.files.upload_from(volume_file_path, file_path, overwrite=overwrite)
             return True
         except Exception as e:
             logger.error(f"Failed to upload file {file_path} to {volume_file_path}: {e}")
             raise VolumeUploadError(file_path, volume_file_path, e)
 
+    def upload_bytes(
+        self,
+        contents: Union[bytes, BinaryIO],
+        destination_filename: str,
+        overwrite: bool = False,
+        assume_exists: Optional[bool] = None,
+    ) -> bool:
+        """Uploads in-memory data or a readable binary stream to the volume using Files API upload.
+
+        Unlike upload_file, this needs no local copy of the data, so callers holding
+        an open stream (e.g. a web upload) can pass it straight through.
+
+        Args:
+            contents: Bytes or a binary file-like object positioned at the start of the data
+            destination_filename: Filename to use in the volume
+            overwrite: Whether to overwrite existing files
+            assume_exists: Whether the destination is already known to exist, e.g. from a
+                prior list_files call. When given, the per-file existence lookup is skipped.
+
+        Returns:
+            True if upload was successful
+
+        Raises:
+            FileAlreadyExistsError: If the file already exists in the volume and overwrite is False
+            VolumeUploadError: If there's an error during the upload process
+        """
+        volume_file_path = self.volume.get_file_path(destination_filename)
+
+        if not overwrite and self._exists_for_upload(destination_filename, assume_exists):
+            logger.error(f"File {destination_filename} already exists in volume {self.volume.volume_name} and overwrite is False.")
+            raise FileAlreadyExistsError(destination_filename, self.volume.volume_name)
+
+        if isinstance(contents, bytes):
+            contents = io.BytesIO(contents)
+
+        try:
+            self.client.files.upload(volume_file_path, contents, overwrite=overwrite)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upload {destination_filename} to {volume_file_path}: {e}")
+            raise VolumeUploadError(destination_filename, volume_file_path, e)
+
     def download_file(self, file_name: str, download_path: str) -> bool:
         """Downloads a file from the volume onto the local filesystem using Files API download."""
         volume_file_path = self.volume.get_file_path(file_name)
@@ -132,6 +219,16 @@ class VolumeFileStore:
             logger.error(f"Failed to download file {file_name} to {download_path}: {e}")
             return False
 
+    def download_bytes(self, file_name: str) -> bytes:
+        """Downloads a file from the volume into memory using Files API download.
+
+        Unlike download_file, this writes nothing to the local filesystem, and
+        failures propagate to the caller rather than being logged.
+        """
+        volume_file_path = self.volume.get_file_path(file_name)
+        resp = self.client.files.download(volume_file_path)
+        return resp.contents.read()
+
 
 def create_volume_from_config(catalog: Optional[str] = None, schema: Optional[str] = None, volume_name: Optional[str] = None) -> Volume:
     """Create a Volume instance using configuration defaults.
@@ -1,9 +1,12 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Union
 
+import cv2
+import numpy as np
 from pydantic import BaseModel
 from backend.config import get_config
-from backend.databricks.auth import get_databricks_auth
 from backend.logging import get_logger
 
 
@@ -17,6 +20,37 @@ class PageFragment:
         self.bbox = bbox
         self.content = content
 
+@dataclass
+class FragmentSoA:
+    """Column-oriented (structure-of-arrays) storage for a page's fragments.
+
+    Row i of bboxes, contents, and complexities describes the same fragment, so
+    numeric work over bounding boxes can be done as single array operations.
+    """
+
+    bboxes: np.ndarray  # (N, 4) int32 of x1, y1, x2, y2
+    contents: list[bytes]
+    complexities: np.ndarray  # (N,) float32, NaN where complexity was not computed
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __getitem__(self, index: int) -> PageFragment:
+        """Build a PageFragment for a single row."""
+        return PageFragment(content=self.contents[index], bbox=self.bboxes[index].tolist())
+
+    def __iter__(self) -> Iterator[PageFragment]:
+        return (self[i] for i in range(len(self)))
+
+    @classmethod
+    def from_fragments(cls, fragments: list[PageFragment]) -> "FragmentSoA":
+        """Convert a list of PageFragment objects into column-oriented storage."""
+        return cls(
+            bboxes=np.array([f.bbox for f in fragments], dtype=np.int32).reshape(-1, 4),
+            contents=[f.content for f in fragments],
+            complexities=np.full(len(fragments), np.nan, dtype=np.float32),
+        )
+
 class PageMetadata(BaseModel):
     """Class that holds metadata for a page."""
     pass
@@ -27,18 +61,36 @@ class DocumentMetadata(BaseModel):
 
 class Page:
     """Class that holds a page of a document."""
-    def __init__(self, page_number: int, content: bytes) -> None:
+    def __init__(self, page_number: int, content: bytes, image_array: np.ndarray | None = None) -> None:
         self.page_number = page_number
         self.content = content
+        self._image_array = image_array
         self.fragments: list[PageFragment] = []
+        self.fragments_soa: FragmentSoA | None = None
         self.metadata: PageMetadata = PageMetadata()
+        # Decoded BGR image from before any resizing, kept only on request by DocumentFactory
+        self.source_image: np.ndarray | None = None
+        # (width, height) of the source image at full resolution, set alongside source_image
+        self.source_size: tuple[int, int] | None = None
+
+    @property
+    def image_array(self) -> np.ndarray | None:
+        """The page content as a decoded BGR uint8 array.
+
+        Decoded from content on first access and cached; None if the content cannot be decoded.
+        DocumentFactory can supply the array up front so no encode/decode round-trip is needed.
+        """
+        if self._image_array is None and self.content:
+            self._image_array = cv2.imdecode(np.frombuffer(self.content, np.uint8), cv2.IMREAD_COLOR)
+        return self._image_array
 
     def fragment(
         self,
         tile_size: tuple[int, int] | None = None,
         overlap_ratio: float | None = None,
         complexity_threshold: float | None = None,
-    ) -> list[PageFragment]:
+        stream: bool = False,
+    ) -> list[PageFragment] | Iterator[PageFragment]:
         """Fragment this page into smaller rectangular tiles.
         
         This method uses the Fragmenter to create fragments and populates
@@ -48,12 +100,24 @@ class Page:
             tile_size: Optional (width, height) tuple for tile dimensions
             overlap_ratio: Optional overlap ratio for tiles (0.0 to 1.0)
             complexity_threshold: Optional threshold for skipping blank tiles
+            stream: If True, return a generator that yields fragments one at a
+                time instead of a list. self.fragments is left untouched so the
+                encoded tiles are not all held in memory at once.
             
         Returns:
-            List of PageFragment objects (same as self.fragments)
+            List of PageFragment objects (same as self.fragments), or an
+            iterator over them when stream is True
         """
         # Import here to avoid circular imports
         from backend.documents.fragmenter import Fragmenter
+
+        if stream:
+            return Fragmenter.iter_tile_page(
+                self,
+                tile_size=tile_size,
+                overlap_ratio=overlap_ratio,
+                complexity_threshold=complexity_threshold
+            )
         
         self.fragments = Fragmenter.tile_page(
             self, 
@@ -63,6 +127,35 @@ class Page:
         )
         return self.fragments
 
+    def fragment_soa(
+        self,
+        tile_size: tuple[int, int] | None = None,
+        overlap_ratio: float | None = None,
+        complexity_threshold: float | None = None,
+    ) -> FragmentSoA:
+        """Fragment this page into column-oriented storage.
+
+        Populates self.fragments_soa with the results.
+
+        Args:
+            tile_size: Optional (width, height) tuple for tile dimensions
+            overlap_ratio: Optional overlap ratio for tiles (0.0 to 1.0)
+            complexity_threshold: Optional threshold for skipping blank tiles
+
+        Returns:
+            FragmentSoA (same as self.fragments_soa)
+        """
+        # Import here to avoid circular imports
+        from backend.documents.fragmenter import Fragmenter
+
+        self.fragments_soa = Fragmenter.tile_page_soa(
+            self,
+            tile_size=tile_size,
+            overlap_ratio=overlap_ratio,
+            complexity_threshold=complexity_threshold
+        )
+        return self.fragments_soa
+
 class Document:
     """Class that holds a document and its metadata.
 
@@ -1,23 +1,61 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 import cv2
 import numpy as np
 import fitz  # PyMuPDF
-import tempfile
+from PIL import Image
 
 from backend.documents.document import Document, Page
-from backend.databricks.volume import Volume, VolumeFileStore
 from backend.config import get_config
 
+if TYPE_CHECKING:
+    # The Databricks SDK takes over a second to import; only volume loads need it,
+    # and their callers have already imported it to build the store
+    from backend.databricks.volume import VolumeFileStore
+
+# Threads JPEG-encoding rendered PDF pages while the next page renders
+PDF_ENCODE_WORKERS = min(4, os.cpu_count() or 1)
+
+# libjpeg can decode straight to 1/2, 1/4 or 1/8 scale, largest reduction first
+_JPEG_REDUCED_READ_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
 class DocumentFactory:
     """Factory class for creating Document objects from either a local path or Databricks volume."""
 
 
-    def _resize_image_if_needed(self, image: np.ndarray) -> np.ndarray:
-        """Resize image if it exceeds maximum dimensions while preserving aspect ratio."""
-        app_config = get_config()  # Get config dynamically
+    def _resize_image_if_needed(
+        self,
+        image: np.ndarray,
+        max_width: int | None = None,
+        max_height: int | None = None,
+        full_size: tuple[int, int] | None = None,
+    ) -> np.ndarray:
+        """Resize image if it exceeds maximum dimensions while preserving aspect ratio.
+
+        Limits not given are read from config; callers resizing many pages pass them
+        in so config is read once per document rather than once per page. An image
+        decoded at reduced scale passes its full (width, height) as full_size, so the
+        output size is computed from it and matches a full decode to the pixel.
+        """
+        if max_width is None or max_height is None:
+            app_config = get_config()  # Get config dynamically
+            max_width = app_config.image_max_width if max_width is None else max_width
+            max_height = app_config.image_max_height if max_height is None else max_height
         height, width = image.shape[:2]
-        max_width = app_config.image_max_width
-        max_height = app_config.image_max_height
+        if full_size is not None:
+            full_width, full_height = full_size
+            # OpenCV applies any EXIF rotation after decoding, which the header size predates
+            if (full_width - full_height) * (width - height) < 0:
+                full_width, full_height = full_height, full_width
+            width, height = full_width, full_height
         
         if width <= max_width and height <= max_height:
             return image
@@ -35,11 +73,79 @@ class DocumentFactory:
         resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
         return resized
 
+    def _image_read_flag(self, source) -> tuple[int, tuple[int, int] | None]:
+        """Picks the OpenCV read flag for an image file or stream.
+
+        JPEGs far larger than the size limits are decoded at a reduced scale, which
+        skips most of the decode work; the result is never smaller than the size the
+        image would be resized to anyway.
+
+        Returns:
+            The read flag, and for a reduced decode the full (width, height) from the
+            header, which _resize_image_if_needed needs to size the page exactly
+        """
+        app_config = get_config()  # Get config dynamically
+        try:
+            # Only parses the header
+            with Image.open(source) as image:
+                if image.format != "JPEG":
+                    return cv2.IMREAD_COLOR, None
+                width, height = image.size
+        except Exception:
+            return cv2.IMREAD_COLOR, None
+
+        # OpenCV applies any EXIF rotation after decoding, so allow for either orientation
+        max_width, max_height = app_config.image_max_width, app_config.image_max_height
+        scale = max(min(max_width / width, max_height / height), min(max_width / height, max_height / width))
+        for factor, flag in _JPEG_REDUCED_READ_FLAGS:
+            if factor * scale <= 1:
+                return flag, (width, height)
+        return cv2.IMREAD_COLOR, None
+
     def from_disk(self, path: Path) -> Document:
         """Creates a Document object from a local path."""
         return self._create_document(path)
 
-    def from_databricks_volume(self, file_name: str, file_store: VolumeFileStore) -> Document:
+    def from_bytes(
+        self, content: bytes, filename: str, keep_source_images: bool = False, source_max_dim: int | None = None
+    ) -> Document:
+        """Creates a Document object from in-memory file contents.
+
+        Args:
+            content: The raw bytes of an image or PDF file.
+            filename: Name of the file; its suffix selects the loader and it becomes the Document path.
+            keep_source_images: If True, each page's decoded image from before any resizing is
+                kept on Page.source_image and its resized image on Page.image_array, so callers
+                that also need them do not decode or render the file a second time.
+            source_max_dim: If given, kept source images are downscaled so their longest side is
+                at most this; Page.source_size still records the full-resolution size. PDF pages
+                are then never rendered at full resolution at all.
+
+        Returns:
+            Document: The created Document object, built without touching the filesystem.
+        """
+        app_config = get_config()  # Get config dynamically
+        path = Path(filename)
+        suffix = path.suffix.lower()
+
+        if suffix in app_config.allowed_image_extensions:
+            flag, full_size = cv2.IMREAD_COLOR, None
+            if not keep_source_images:
+                flag, full_size = self._image_read_flag(io.BytesIO(content))
+            image = cv2.imdecode(np.frombuffer(content, np.uint8), flag)
+            if image is None:
+                raise ValueError(f"Failed to decode image: {filename}")
+            return self._document_from_image(image, path, keep_source_images, source_max_dim, full_size)
+        elif suffix in app_config.allowed_pdf_extensions:
+            try:
+                doc = fitz.open(stream=content, filetype="pdf")
+            except Exception as e:
+                raise RuntimeError(f"Failed to convert PDF to images: {e}")
+            return self._document_from_pdf(doc, path, keep_source_images, source_max_dim)
+        else:
+            raise ValueError(f"Unsupported file type: {suffix}")
+
+    def from_databricks_volume(self, file_name: str, file_store: "VolumeFileStore") -> Document:
         """Creates a Document object from a file in a Databricks volume.
 
         Args:
@@ -51,15 +157,10 @@ class DocumentFactory:
         """
         app_config = get_config()  # Get config dynamically
         suffix = Path(file_name).suffix.lower()
-        with tempfile.NamedTemporaryFile(delete=True, suffix=suffix) as tmp_file:
-            file_store.download_file(file_name, tmp_file.name)
-            tmp_path = Path(tmp_file.name)
-            if suffix in app_config.allowed_image_extensions:
-                return self._create_document_from_image(tmp_path)
-            elif suffix in app_config.allowed_pdf_extensions:
-                return self._create_document_from_pdf(tmp_path)
-            else:
-                raise ValueError(f"Unsupported file type: {suffix}")
+        if suffix not in app_config.allowed_image_extensions and suffix not in app_config.allowed_pdf_extensions:
+            raise ValueError(f"Unsupported file type: {suffix}")
+        # Decode straight from memory rather than round-tripping through a temp file
+        return self.from_bytes(file_store.download_bytes(file_name), file_name)
 
     def _create_document(self, path: Path) -> Document:
         """Creates a Document object from a local path handling multiple file types."""
@@ -74,34 +175,124 @@ class DocumentFactory:
 
     def _create_document_from_image(self, path: Path) -> Document:
         """Creates a Document object from a single image file."""
-        image = cv2.imread(str(path))
+        flag, full_size = self._image_read_flag(path)
+        image = cv2.imread(str(path), flag)
         if image is None:
             raise ValueError(f"Failed to read image from path: {path}")
-        
+        return self._document_from_image(image, path, full_size=full_size)
+
+    def _document_from_image(
+        self,
+        image: np.ndarray,
+        path: Path,
+        keep_source_images: bool = False,
+        source_max_dim: int | None = None,
+        full_size: tuple[int, int] | None = None,
+    ) -> Document:
+        """Creates a single-page Document object from a decoded image.
+
+        full_size is the header (width, height) of an image decoded at reduced scale.
+        """
         # Resize image if it exceeds maximum dimensions
-        resized_image = self._resize_image_if_needed(image)
+        resized_image = self._resize_image_if_needed(image, full_size=full_size)
         
-        page = Page(page_number=1, content=cv2.imencode(".jpg", resized_image)[1].tobytes())
+        page = Page(
+            page_number=1,
+            content=cv2.imencode(".jpg", resized_image)[1].tobytes(),
+            image_array=resized_image if keep_source_images else None,
+        )
+        if keep_source_images:
+            page.source_size = (image.shape[1], image.shape[0])
+            if source_max_dim is not None:
+                image = self._resize_image_if_needed(image, source_max_dim, source_max_dim)
+            page.source_image = image
         return Document(path=path, pages=[page])
 
     def _create_document_from_pdf(self, path: Path) -> Document:
         """Creates a Document object from a PDF file, potentially with multiple pages."""
-        app_config = get_config()  # Get config dynamically
         try:
             doc = fitz.open(str(path))
+        except Exception as e:
+            raise RuntimeError(f"Failed to convert PDF to images: {e}")
+        return self._document_from_pdf(doc, path)
+
+    def _render_pdf_page(self, page: fitz.Page, zoom: float) -> tuple[fitz.Pixmap, np.ndarray]:
+        """Renders a PDF page straight to 3-channel RGB at the given zoom.
+
+        The array views the pixmap's buffer rather than copying it out via pix.samples,
+        so it is only valid while the returned pixmap is alive.
+        """
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False)
+        return pix, np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+
+    def _document_from_pdf(
+        self, doc: fitz.Document, path: Path, keep_source_images: bool = False, source_max_dim: int | None = None
+    ) -> Document:
+        """Creates a Document object with one page per page of an open PDF.
+
+        PyMuPDF is not thread-safe, so pages are rendered and resized one at a time on
+        the calling thread, while JPEG encoding runs on a small pool and overlaps with
+        rendering the pages that follow. Only a few pages' pixels are in flight at once,
+        so memory does not grow with the page count.
+        """
+        app_config = get_config()  # Get config dynamically
+        dpi = app_config.image_dpi
+        max_width, max_height = app_config.image_max_width, app_config.image_max_height
+        # Only a caller keeping unshrunk source images needs each page at the full DPI
+        keep_full_render = keep_source_images and source_max_dim is None
+        try:
             pages = []
-            for i, page in enumerate(doc):
-                # Use configurable DPI instead of hardcoded 300
-                pix = page.get_pixmap(dpi=app_config.image_dpi)
-                img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
-                if img.shape[2] == 4:
-                    img = cv2.cvtColor(img, cv2.COLOR_RGBA2RGB)
-                
-                # Resize image if it exceeds maximum dimensions
-                resized_img = self._resize_image_if_needed(img)
-                
-                image_content = cv2.imencode(".jpg", resized_img)[1].tobytes()
-                pages.append(Page(page_number=i + 1, content=image_content))
+            # Pages whose encode is still running; bounded so that rendering never runs far
+            # ahead of encoding with every pending page's pixels held in memory
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=PDF_ENCODE_WORKERS) as executor:
+                for page_number, page in enumerate(doc, start=1):
+                    # Use configurable DPI instead of hardcoded 300, capped so the render
+                    # already fits the size limits unless it doubles as the source image
+                    full_zoom = dpi / 72
+                    zoom = full_zoom
+                    if not keep_full_render:
+                        zoom = min(zoom, max_width / page.rect.width, max_height / page.rect.height)
+                    pix, img = self._render_pdf_page(page, zoom)
+                    if keep_full_render:
+                        img = img.copy()
+
+                    # Resize image if it exceeds maximum dimensions (at most by a rounding pixel
+                    # when the render DPI was already capped)
+                    resized_img = self._resize_image_if_needed(img, max_width, max_height)
+                    # PyMuPDF renders RGB but the page is encoded and kept in OpenCV's BGR order.
+                    # The flip also gives the encode, which outlives this pixmap, its own buffer
+                    resized_img = np.ascontiguousarray(resized_img[..., ::-1])
+
+                    # Content is filled in once the page's encode finishes
+                    doc_page = Page(
+                        page_number=page_number,
+                        content=b"",
+                        image_array=resized_img if keep_source_images else None,
+                    )
+                    if keep_full_render:
+                        # PyMuPDF renders RGB; expose it in OpenCV channel order without a copy
+                        doc_page.source_image = img[..., ::-1]
+                    elif keep_source_images:
+                        # A small extra render is far cheaper than a full-DPI one
+                        source_zoom = min(full_zoom, source_max_dim / max(page.rect.width, page.rect.height))
+                        # The array only views the pixmap's buffer, so hold the pixmap until copied
+                        source_pix, source = self._render_pdf_page(page, source_zoom)
+                        doc_page.source_image = source.copy()[..., ::-1]
+                        del source_pix
+                    if keep_source_images:
+                        # Size of the full-DPI render, which MuPDF rounds out to whole pixels
+                        full_rect = (page.rect * fitz.Matrix(full_zoom, full_zoom)).irect
+                        doc_page.source_size = (full_rect.width, full_rect.height)
+                    pages.append(doc_page)
+
+                    pending.append((doc_page, executor.submit(cv2.imencode, ".jpg", resized_img)))
+                    if len(pending) > PDF_ENCODE_WORKERS:
+                        finished_page, encoded = pending.popleft()
+                        finished_page.content = encoded.result()[1].tobytes()
+
+                for finished_page, encoded in pending:
+                    finished_page.content = encoded.result()[1].tobytes()
             return Document(path=path, pages=pages)
         except Exception as e:
             raise RuntimeError(f"Failed to convert PDF to images: {e}")
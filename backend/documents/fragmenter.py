@@ -1,15 +1,30 @@
 """Document fragmentation functionality for splitting pages into smaller fragments."""
 
+import threading
+from collections.abc import Iterator
 
 import cv2
 import numpy as np
 
 from backend.config import get_config
-from backend.documents.document import Page, PageFragment
+from backend.documents.document import FragmentSoA, Page, PageFragment
 from backend.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Per-thread scratch buffers reused across pages for the complexity pipeline
+_scratch = threading.local()
+
+
+def _scratch_view(scratch: dict[str, np.ndarray], key: str, shape: tuple[int, ...], dtype: type) -> np.ndarray:
+    """Return a contiguous view of a scratch buffer, growing it only when it is too small."""
+    size = int(np.prod(shape))
+    buffer = scratch.get(key)
+    if buffer is None or buffer.dtype != dtype or buffer.size < size:
+        buffer = np.empty(size, dtype=dtype)
+        scratch[key] = buffer
+    return buffer[:size].reshape(shape)
+
 
 class Fragmenter:
     """Handles fragmentation of document pages into smaller rectangular fragments."""
@@ -32,6 +47,97 @@ class Fragmenter:
         Returns:
             List of PageFragment objects
 
+        """
+        fragments = list(
+            Fragmenter.iter_tile_page(
+                page,
+                tile_size=tile_size,
+                overlap_ratio=overlap_ratio,
+                complexity_threshold=complexity_threshold,
+            )
+        )
+        logger.info(f"Created {len(fragments)} fragments for page {page.page_number}")
+        return fragments
+
+    @staticmethod
+    def iter_tile_page(
+        page: Page,
+        tile_size: tuple[int, int] | None = None,
+        overlap_ratio: float | None = None,
+        complexity_threshold: float | None = None,
+    ) -> Iterator[PageFragment]:
+        """Lazily fragment a page into smaller rectangular tiles.
+
+        Fragments are encoded and yielded one at a time, so callers that process
+        and discard each fragment only hold a single encoded tile in memory.
+
+        Args:
+            page: The page to fragment
+            tile_size: Optional (width, height) tuple for tile dimensions
+            overlap_ratio: Optional overlap ratio for tiles (0.0 to 1.0)
+            complexity_threshold: Optional threshold for skipping blank tiles
+
+        Yields:
+            PageFragment objects in row-major tile order
+
+        """
+        for bbox, content, _ in Fragmenter._iter_tiles(
+            page,
+            tile_size=tile_size,
+            overlap_ratio=overlap_ratio,
+            complexity_threshold=complexity_threshold,
+        ):
+            yield PageFragment(content=content, bbox=list(bbox))
+
+    @staticmethod
+    def tile_page_soa(
+        page: Page,
+        tile_size: tuple[int, int] | None = None,
+        overlap_ratio: float | None = None,
+        complexity_threshold: float | None = None,
+    ) -> FragmentSoA:
+        """Fragment a page into column-oriented fragment storage.
+
+        Args:
+            page: The page to fragment
+            tile_size: Optional (width, height) tuple for tile dimensions
+            overlap_ratio: Optional overlap ratio for tiles (0.0 to 1.0)
+            complexity_threshold: Optional threshold for skipping blank tiles
+
+        Returns:
+            FragmentSoA holding bounding boxes, contents, and complexities
+
+        """
+        bboxes: list[tuple[int, int, int, int]] = []
+        contents: list[bytes] = []
+        complexities: list[float] = []
+        for bbox, content, complexity in Fragmenter._iter_tiles(
+            page,
+            tile_size=tile_size,
+            overlap_ratio=overlap_ratio,
+            complexity_threshold=complexity_threshold,
+        ):
+            bboxes.append(bbox)
+            contents.append(content)
+            complexities.append(complexity)
+
+        logger.info(f"Created {len(contents)} fragments for page {page.page_number}")
+        return FragmentSoA(
+            bboxes=np.array(bboxes, dtype=np.int32).reshape(-1, 4),
+            contents=contents,
+            complexities=np.array(complexities, dtype=np.float32),
+        )
+
+    @staticmethod
+    def _iter_tiles(
+        page: Page,
+        tile_size: tuple[int, int] | None = None,
+        overlap_ratio: float | None = None,
+        complexity_threshold: float | None = None,
+    ) -> Iterator[tuple[tuple[int, int, int, int], bytes, float]]:
+        """Yield (bbox, encoded JPEG, complexity) for each kept tile of a page.
+
+        Complexity is NaN when no complexity threshold is applied.
         """
         config = get_config()
 
@@ -48,13 +154,19 @@ class Fragmenter:
         if complexity_threshold is None:
             complexity_threshold = config.fragment_complexity_threshold
 
+        # Bail out before decoding when there is nothing to decode; cv2.imdecode
+        # already rejects unknown signatures cheaply but asserts on empty buffers
+        if not page.content:
+            logger.warning(f"Page {page.page_number} has no content to fragment")
+            return
+
         # Decode the page image
         nparr = np.frombuffer(page.content, np.uint8)
         image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
         if image is None:
             logger.warning(f"Failed to decode image for page {page.page_number}")
-            return []
+            return
 
         height, width = image.shape[:2]
         logger.debug(f"Fragmenting page {page.page_number} with dimensions {width}x{height}")
@@ -63,51 +175,117 @@ class Fragmenter:
         step_width = int(tile_width * (1 - overlap_ratio))
         step_height = int(tile_height * (1 - overlap_ratio))
 
-        fragments = []
-
-        # Generate tiles
-        for y in range(0, height, step_height):
-            for x in range(0, width, step_width):
-                # Calculate tile boundaries
-                x1 = x
-                y1 = y
-                x2 = min(x + tile_width, width)
-                y2 = min(y + tile_height, height)
-
-                # Skip if tile is too small, unless we want 100% coverage (complexity_threshold == 0)
-                if complexity_threshold > 0 and ((x2 - x1) < tile_width // 2 or (y2 - y1) < tile_height // 2):
-                    continue
-
-                # Extract tile
-                tile = image[y1:y2, x1:x2]
-
-                # Check complexity if threshold is set
-                if complexity_threshold > 0:
-                    complexity = Fragmenter._calculate_complexity(tile)
-                    if complexity < complexity_threshold:
-                        logger.debug(
-                            "Skipping tile at (%s, %s) due to low complexity: %.3f", 
-                            x1, y1, complexity
+        # Build the non-white pixel summed-area table once per page so each
+        # tile's complexity is an O(1) lookup instead of a pass over its pixels.
+        # Its buffers come from a per-thread pool and are checked out for the
+        # lifetime of this generator so interleaved generators never share them
+        non_white_integral = None
+        scratch = None
+        try:
+            if complexity_threshold > 0:
+                scratch = getattr(_scratch, "buffers", None) or {}
+                _scratch.buffers = None
+                non_white_integral = Fragmenter._non_white_integral(image, scratch)
+
+            # Generate tiles
+            for y in range(0, height, step_height):
+                for x in range(0, width, step_width):
+                    # Calculate tile boundaries
+                    x1 = x
+                    y1 = y
+                    x2 = min(x + tile_width, width)
+                    y2 = min(y + tile_height, height)
+
+                    # Skip if tile is too small, unless we want 100% coverage (complexity_threshold == 0)
+                    if complexity_threshold > 0 and ((x2 - x1) < tile_width // 2 or (y2 - y1) < tile_height // 2):
+                        continue
+
+                    # Check complexity if threshold is set
+                    complexity = float("nan")
+                    if non_white_integral is not None:
+                        complexity = Fragmenter._integral_complexity(
+                            non_white_integral, x1, y1, x2, y2
                         )
+                        if complexity < complexity_threshold:
+                            logger.debug(
+                                "Skipping tile at (%s, %s) due to low complexity: %.3f", 
+                                x1, y1, complexity
+                            )
+                            continue
+
+                    # Encode tile as JPEG straight from the decoded BGR buffer; imdecode
+                    # and imencode share channel order so no colorspace pass is needed
+                    success, encoded_tile = cv2.imencode(".jpg", image[y1:y2, x1:x2])
+                    if not success:
+                        logger.warning(f"Failed to encode tile at ({x1}, {y1})")
                         continue
 
-                # Encode tile as JPEG
-                success, encoded_tile = cv2.imencode(".jpg", tile)
-                if not success:
-                    logger.warning(f"Failed to encode tile at ({x1}, {y1})")
-                    continue
+                    logger.debug(f"Created fragment at ({x1}, {y1}, {x2}, {y2}) with complexity check")
 
-                # Create fragment
-                fragment = PageFragment(
-                    content=encoded_tile.tobytes(),
-                    bbox=[x1, y1, x2, y2],
-                )
-                fragments.append(fragment)
+                    yield (x1, y1, x2, y2), encoded_tile.tobytes(), complexity
+        finally:
+            if scratch is not None:
+                _scratch.buffers = scratch
 
-                logger.debug(f"Created fragment at ({x1}, {y1}, {x2}, {y2}) with complexity check")
+    @staticmethod
+    def _non_white_integral(
+        image: np.ndarray, scratch: dict[str, np.ndarray] | None = None
+    ) -> np.ndarray:
+        """Build a summed-area table of non-white pixels for an image.
 
-        logger.info(f"Created {len(fragments)} fragments for page {page.page_number}")
-        return fragments
+        Uses the same grayscale threshold as _calculate_complexity.
+
+        Args:
+            image: Input image as numpy array
+            scratch: Optional buffer pool; when given, the intermediate and output
+                arrays are written into reused buffers instead of fresh allocations
+
+        Returns:
+            (height + 1, width + 1) integral image of the non-white pixel mask
+
+        """
+        height, width = image.shape[:2]
+
+        def buffer(key: str, shape: tuple[int, ...], dtype: type) -> np.ndarray | None:
+            return None if scratch is None else _scratch_view(scratch, key, shape, dtype)
+
+        if len(image.shape) == 3:
+            gray = cv2.cvtColor(
+                image, cv2.COLOR_BGR2GRAY, dst=buffer("gray", (height, width), np.uint8)
+            )
+        else:
+            gray = image
+
+        # 1 where gray < 240, 0 otherwise
+        _, non_white = cv2.threshold(
+            gray, 239, 1, cv2.THRESH_BINARY_INV, dst=buffer("mask", (height, width), np.uint8)
+        )
+        return cv2.integral(
+            non_white,
+            sum=buffer("integral", (height + 1, width + 1), np.int32),
+            sdepth=cv2.CV_32S,
+        )
+
+    @staticmethod
+    def _integral_complexity(integral: np.ndarray, x1: int, y1: int, x2: int, y2: int) -> float:
+        """Calculate the complexity of a region from a non-white summed-area table.
+
+        Args:
+            integral: Integral image from _non_white_integral
+            x1, y1, x2, y2: Region bounds (exclusive of x2 and y2)
+
+        Returns:
+            Complexity score between 0.0 and 1.0
+
+        """
+        total_pixels = (x2 - x1) * (y2 - y1)
+        if total_pixels <= 0:
+            return 0.0
+
+        non_white_pixels = (
+            integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        )
+        return float(non_white_pixels) / total_pixels
 
     @staticmethod
     def _calculate_complexity(image: np.ndarray) -> float:
@@ -1,7 +1,7 @@
 """Document parser for extracting data from P&ID pages using LLM."""
 
 import base64
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List
 from backend.documents.document import Page, Document
 from backend.llm.openai_client import OpenAIClient
 from backend.llm.prompt_loader import load_prompt
@@ -11,13 +11,20 @@ from backend.logging import get_logger
 class DocumentParser:
     """Parser for extracting structured data from document pages using LLM."""
     
-    def __init__(self, openai_client: OpenAIClient) -> None:
+    def __init__(
+        self,
+        openai_client: OpenAIClient,
+        *,
+        b64_encoder: Callable[[bytes], bytes] = base64.b64encode,
+    ) -> None:
         """Initialize the document parser.
         
         Args:
             openai_client: OpenAI client instance for LLM interactions
+            b64_encoder: Function used to base64-encode page images
         """
         self.openai_client = openai_client
+        self.b64_encoder = b64_encoder
         self.logger = get_logger(__name__)
         
     def parse_page(self, page: Page) -> str:
@@ -44,7 +51,7 @@ class DocumentParser:
             raise ValueError(f"Page {page.page_number} has no content to parse")
         
         # Encode image data as base64
-        image_base64 = base64.b64encode(page.content).decode('utf-8')
+        image_base64 = self.b64_encoder(page.content).decode('utf-8')
         
         # Prepare messages for OpenAI Vision API
         messages = [
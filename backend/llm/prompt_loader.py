@@ -1,14 +1,20 @@
 """Utility functions for loading prompts."""
 
+from functools import lru_cache
 from pathlib import Path
 from backend.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
 def load_prompt(prompt_name: str) -> str:
     """Load a prompt from the prompts directory.
     
+    Prompt files are immutable package assets, so each one is read from disk
+    once per process and served from cache afterwards. Call
+    ``load_prompt.cache_clear()`` to force a re-read.
+    
     Args:
         prompt_name: Name of the prompt file (without .prompt extension)
         
@@ -2,19 +2,35 @@ import os
 from loguru import logger
 from backend.config import get_config
 
+_LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+_log_level: str | None = None
+
+def set_level(level: str) -> None:
+    """Reconfigure the application log sink at the given level.
+
+    Args:
+        level (str): Loguru level name, e.g. "INFO" or "warning".
+    """
+    global _log_level
+    _log_level = level.upper()
+    logger.remove()
+    logger.add(
+        sink=lambda msg: print(msg, end=""),
+        level=_log_level,
+        format=_LOG_FORMAT
+    )
+
+def get_level() -> str | None:
+    """Return the level the application log sink was last configured with."""
+    return _log_level
+
 class AppLogger:
     """Global logger configuration for the application.
 
     Sets the log level from get_config().log_level.
     """
     def __init__(self) -> None:
-        log_level = get_config().log_level.upper()
-        logger.remove()
-        logger.add(
-            sink=lambda msg: print(msg, end=""),
-            level=log_level,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-        )
+        set_level(get_config().log_level)
         self.logger = logger
 
     def get_logger(self, name: str = None):
@@ -0,0 +1,54 @@
+"""Shared test data for backend tests."""
+
+from unittest.mock import Mock
+
+from backend.documents.document import Page
+
+# Minimal 1x1 PNG used as page content
+TINY_PNG_BYTES = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82'
+
+# OpenAI settings installed for every test module by the conftest _default_config fixture
+OPENAI_TEST_CONFIG = {
+    "openai_base_url": "https://api.openai.com/v1",
+    "openai_api_key": "test-key",
+    "openai_model": "gpt-4o",
+    "openai_temperature": 0.2,
+    "openai_max_tokens": 5000,
+}
+
+
+def tiny_png_page(number: int = 1) -> Page:
+    """Return a page whose content is the minimal 1x1 PNG."""
+    return Page(page_number=number, content=TINY_PNG_BYTES)
+
+
+class StubFiles:
+    """Stand-in for WorkspaceClient.files exposing only the calls VolumeFileStore makes."""
+
+    def __init__(self) -> None:
+        self.upload = Mock()
+        self.upload_from = Mock()
+        self.download = Mock()
+        self.get_metadata = Mock()
+        self.list_directory_contents = Mock()
+
+
+class StubVolumes:
+    """Stand-in for WorkspaceClient.volumes."""
+
+    def __init__(self) -> None:
+        self.read = Mock()
+
+
+class StubClient:
+    """Minimal WorkspaceClient stand-in whose API calls are plain Mock recorders."""
+
+    def __init__(self) -> None:
+        self.files = StubFiles()
+        self.volumes = StubVolumes()
+
+    def reset_mock(self) -> None:
+        """Clear recorded calls, return values and side effects on every API call."""
+        for api in (self.files, self.volumes):
+            for call_recorder in vars(api).values():
+                call_recorder.reset_mock(return_value=True, side_effect=True)
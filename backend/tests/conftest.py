@@ -0,0 +1,45 @@
+"""Shared fixtures for backend tests."""
+
+import copy
+from collections.abc import Callable, Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from backend.config import reset_config_for_test, set_config_for_test
+from backend.llm.document_parser import DocumentParser
+from backend.llm.openai_client import OpenAIClient
+from backend.tests._fixtures import OPENAI_TEST_CONFIG
+
+# Spec'd once at import; Mock(spec=...) introspects the class on every construction
+_CLIENT_MOCK_PROTO = Mock(spec=OpenAIClient)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _default_config() -> Iterator[None]:
+    """Install the shared test config once per module; tests needing other values override it."""
+    set_config_for_test(**OPENAI_TEST_CONFIG)
+    yield
+    # Reset to a plain environment-derived config for the next module
+    reset_config_for_test()
+
+
+@pytest.fixture(scope="session")
+def openai_client_factory() -> Callable[[], OpenAIClient]:
+    """Return a callable that builds an OpenAIClient from the current config."""
+    return OpenAIClient
+
+
+@pytest.fixture
+def mock_client() -> Mock:
+    """Return a mocked OpenAIClient copied from a shared spec'd prototype."""
+    client = copy.copy(_CLIENT_MOCK_PROTO)
+    # Shallow copies share child mocks, so clear anything a previous test configured
+    client.reset_mock(return_value=True, side_effect=True)
+    return client
+
+
+@pytest.fixture
+def parser(mock_client: Mock) -> DocumentParser:
+    """Return a DocumentParser wrapping a mocked OpenAIClient."""
+    return DocumentParser(mock_client)
@@ -1,7 +1,8 @@
 from pathlib import Path
-import tempfile
 import cv2
 import numpy as np
+import fitz  # PyMuPDF
+from unittest.mock import Mock
 
 import pytest
 
@@ -50,17 +51,76 @@ def test_create_document_from_multi_page_pdf(factory: DocumentFactory):
     assert doc.path == path
 
 
-def test_unsupported_file_type_raises(factory: DocumentFactory):
-    unsupported = ASSETS_DIR / "unsupported.txt"
+@pytest.mark.parametrize("name", ["test_image.jpg", "test_single_pg_pdf.pdf"])
+def test_from_bytes_matches_from_disk(factory: DocumentFactory, name: str):
+    path = ASSETS_DIR / name
+    from_disk = factory.from_disk(path)
+    from_bytes = factory.from_bytes(path.read_bytes(), name)
+
+    assert from_bytes.path == Path(name)
+    assert [p.content for p in from_bytes.pages] == [p.content for p in from_disk.pages]
+
+
+def test_from_bytes_keeps_source_images_on_request(factory: DocumentFactory):
+    content = (ASSETS_DIR / "test_single_pg_pdf.pdf").read_bytes()
+
+    assert factory.from_bytes(content, "doc.pdf").pages[0].source_image is None
+
+    page = factory.from_bytes(content, "doc.pdf", keep_source_images=True).pages[0]
+    processed = cv2.imdecode(np.frombuffer(page.content, np.uint8), cv2.IMREAD_COLOR)
+    assert page.source_image.ndim == 3 and page.source_image.shape[2] == 3
+    assert page.source_image.shape[0] >= processed.shape[0]
+    assert page.source_image.shape[1] >= processed.shape[1]
+
+
+def test_page_image_array_matches_content(factory: DocumentFactory):
+    content = (ASSETS_DIR / "test_image.jpg").read_bytes()
+
+    lazy = factory.from_bytes(content, "image.jpg").pages[0]
+    primed = factory.from_bytes(content, "image.jpg", keep_source_images=True).pages[0]
+
+    decoded = cv2.imdecode(np.frombuffer(lazy.content, np.uint8), cv2.IMREAD_COLOR)
+    assert np.array_equal(lazy.image_array, decoded)
+    assert lazy.image_array is lazy.image_array
+    assert primed.image_array.shape == decoded.shape
+
+
+def test_from_databricks_volume_decodes_downloaded_bytes(factory: DocumentFactory):
+    file_store = Mock()
+    file_store.download_bytes.return_value = (ASSETS_DIR / "test_single_pg_pdf.pdf").read_bytes()
+
+    doc = factory.from_databricks_volume("doc.pdf", file_store)
+
+    file_store.download_bytes.assert_called_once_with("doc.pdf")
+    assert doc.path == Path("doc.pdf")
+    assert len(doc.pages) == 1
+
+
+def test_pdf_pages_are_bgr(factory: DocumentFactory):
+    doc = fitz.open()
+    page = doc.new_page(width=100, height=100)
+    page.draw_rect(page.rect, color=(1, 0, 0), fill=(1, 0, 0))  # Red
+
+    page = factory.from_bytes(doc.tobytes(), "red.pdf", keep_source_images=True).pages[0]
+    decoded = cv2.imdecode(np.frombuffer(page.content, np.uint8), cv2.IMREAD_COLOR)
+    for image in (decoded, page.image_array, page.source_image):
+        assert image[50, 50, 2] > 200 and image[50, 50, 0] < 50
+
+
+def test_from_bytes_unsupported_file_type_raises(factory: DocumentFactory):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        factory.from_bytes(b"Hello, I'm not a PDF or image", "unsupported.txt")
+
+
+def test_unsupported_file_type_raises(factory: DocumentFactory, tmp_path: Path):
+    unsupported = tmp_path / "unsupported.txt"
     unsupported.write_text("Hello, I'm not a PDF or image")
 
     with pytest.raises(ValueError, match="Unsupported file type"):
         factory.from_disk(unsupported)
 
-    unsupported.unlink()  # Clean up
-
 
-def test_image_resize_functionality():
+def test_image_resize_functionality(tmp_path: Path):
     """Test that images are resized when they exceed maximum dimensions."""
     # Create a test image that exceeds max dimensions
     large_image = np.zeros((3000, 4000, 3), dtype=np.uint8)  # 4000x3000 image
@@ -73,37 +133,33 @@ def test_image_resize_functionality():
     )
     
     try:
-        # Create temporary image file
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            cv2.imwrite(tmp_file.name, large_image)
-            tmp_path = Path(tmp_file.name)
-            
-            try:
-                factory = DocumentFactory()
-                doc = factory.from_disk(tmp_path)
-                
-                # Verify document was created
-                assert isinstance(doc, Document)
-                assert len(doc.pages) == 1
-                
-                # Decode the image to check dimensions
-                page_bytes = doc.pages[0].content
-                nparr = np.frombuffer(page_bytes, np.uint8)
-                decoded_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                
-                height, width = decoded_image.shape[:2]
-                
-                # Image should be resized to fit within max dimensions
-                assert width <= 1024
-                assert height <= 768
-                
-                # Should maintain aspect ratio (original was 4000x3000 = 4:3)
-                aspect_ratio = width / height
-                original_aspect_ratio = 4000 / 3000
-                assert abs(aspect_ratio - original_aspect_ratio) < 0.01
-                
-            finally:
-                tmp_path.unlink()
+        # Write the test image into pytest's per-test directory
+        image_path = tmp_path / "image.jpg"
+        cv2.imwrite(str(image_path), large_image)
+        
+        factory = DocumentFactory()
+        doc = factory.from_disk(image_path)
+        
+        # Verify document was created
+        assert isinstance(doc, Document)
+        assert len(doc.pages) == 1
+        
+        # Decode the image to check dimensions
+        page_bytes = doc.pages[0].content
+        nparr = np.frombuffer(page_bytes, np.uint8)
+        decoded_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        
+        height, width = decoded_image.shape[:2]
+        
+        # Image should be resized to fit within max dimensions
+        assert width <= 1024
+        assert height <= 768
+        
+        # Should maintain aspect ratio (original was 4000x3000 = 4:3)
+        aspect_ratio = width / height
+        original_aspect_ratio = 4000 / 3000
+        assert abs(aspect_ratio - original_aspect_ratio) < 0.01
+
     finally:
         # Reset config to defaults for other tests
         set_config_for_test(
@@ -113,7 +169,49 @@ def test_image_resize_functionality():
         )
 
 
-def test_image_no_resize_when_within_limits():
+def test_large_jpeg_decodes_at_reduced_scale(factory: DocumentFactory):
+    """Test that shrink-on-load still yields the same size as a full decode and resize."""
+    set_config_for_test(image_max_width=400, image_max_height=400)
+
+    try:
+        path = ASSETS_DIR / "test_image.jpg"
+        assert factory._image_read_flag(path) == (cv2.IMREAD_REDUCED_COLOR_8, (4096, 2048))
+
+        reduced = factory.from_disk(path).pages[0].image_array
+        full = factory.from_bytes(path.read_bytes(), path.name, keep_source_images=True).pages[0].image_array
+        assert reduced.shape == full.shape
+    finally:
+        set_config_for_test(
+            image_max_width=2048,
+            image_max_height=2048,
+            image_dpi=300
+        )
+
+
+@pytest.mark.parametrize("size", [(5000, 3333), (6001, 4003)])
+def test_reduced_jpeg_decode_matches_full_decode_for_odd_sizes(tmp_path: Path, size: tuple[int, int]):
+    """Test that shrink-on-load sizes odd-sized pages exactly like a full decode and resize."""
+    width, height = size
+    set_config_for_test(image_max_width=1024, image_max_height=768)
+
+    try:
+        path = tmp_path / "odd.jpg"
+        cv2.imwrite(str(path), np.zeros((height, width, 3), dtype=np.uint8))
+        factory = DocumentFactory()
+        assert factory._image_read_flag(path)[0] != cv2.IMREAD_COLOR
+
+        reduced = factory.from_disk(path).pages[0].image_array
+        full = factory.from_bytes(path.read_bytes(), path.name, keep_source_images=True).pages[0].image_array
+        assert reduced.shape == full.shape
+    finally:
+        set_config_for_test(
+            image_max_width=2048,
+            image_max_height=2048,
+            image_dpi=300
+        )
+
+
+def test_image_no_resize_when_within_limits(tmp_path: Path):
     """Test that images are not resized when they're within the maximum dimensions."""
     # Create a small test image
     small_image = np.zeros((200, 300, 3), dtype=np.uint8)  # 300x200 image
@@ -126,32 +224,28 @@ def test_image_no_resize_when_within_limits():
     )
     
     try:
-        # Create temporary image file
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            cv2.imwrite(tmp_file.name, small_image)
-            tmp_path = Path(tmp_file.name)
-            
-            try:
-                factory = DocumentFactory()
-                doc = factory.from_disk(tmp_path)
-                
-                # Verify document was created
-                assert isinstance(doc, Document)
-                assert len(doc.pages) == 1
-                
-                # Decode the image to check dimensions
-                page_bytes = doc.pages[0].content
-                nparr = np.frombuffer(page_bytes, np.uint8)
-                decoded_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                
-                height, width = decoded_image.shape[:2]
-                
-                # Image should be approximately the same size (allowing for JPEG compression)
-                assert 280 <= width <= 320  # Allow some variation due to JPEG compression
-                assert 180 <= height <= 220
-                
-            finally:
-                tmp_path.unlink()
+        # Write the test image into pytest's per-test directory
+        image_path = tmp_path / "image.jpg"
+        cv2.imwrite(str(image_path), small_image)
+        
+        factory = DocumentFactory()
+        doc = factory.from_disk(image_path)
+        
+        # Verify document was created
+        assert isinstance(doc, Document)
+        assert len(doc.pages) == 1
+        
+        # Decode the image to check dimensions
+        page_bytes = doc.pages[0].content
+        nparr = np.frombuffer(page_bytes, np.uint8)
+        decoded_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        
+        height, width = decoded_image.shape[:2]
+        
+        # Image should be approximately the same size (allowing for JPEG compression)
+        assert 280 <= width <= 320  # Allow some variation due to JPEG compression
+        assert 180 <= height <= 220
+
     finally:
         # Reset config to defaults for other tests
         set_config_for_test(
@@ -233,6 +327,53 @@ def test_pdf_image_resizing():
         )
 
 
+def test_pdf_source_image_keeps_full_dpi_when_capped():
+    """Test that capping the PDF render DPI does not shrink a source image the caller asked for."""
+    set_config_for_test(image_dpi=150, image_max_width=400, image_max_height=400)
+
+    try:
+        content = (ASSETS_DIR / "test_single_pg_pdf.pdf").read_bytes()
+        factory = DocumentFactory()
+        capped = factory.from_bytes(content, "doc.pdf").pages[0]
+        kept = factory.from_bytes(content, "doc.pdf", keep_source_images=True).pages[0]
+
+        assert max(capped.image_array.shape[:2]) <= 400
+        assert max(kept.source_image.shape[:2]) > 400
+        assert max(kept.image_array.shape[:2]) <= 400
+    finally:
+        set_config_for_test(
+            image_max_width=2048,
+            image_max_height=2048,
+            image_dpi=300
+        )
+
+
+@pytest.mark.parametrize("name", ["test_image.jpg", "test_single_pg_pdf.pdf"])
+def test_source_max_dim_shrinks_kept_source_images(factory: DocumentFactory, name: str):
+    """Test that capped source images still report their full-resolution size."""
+    content = (ASSETS_DIR / name).read_bytes()
+    full = factory.from_bytes(content, name, keep_source_images=True).pages[0]
+    capped = factory.from_bytes(content, name, keep_source_images=True, source_max_dim=256).pages[0]
+
+    assert full.source_size == full.source_image.shape[1::-1]
+    assert capped.source_size == full.source_size
+    assert max(capped.source_image.shape[:2]) <= 256
+    assert max(capped.image_array.shape[:2]) == max(full.image_array.shape[:2])
+
+
+def test_source_max_dim_pdf_source_matches_direct_render(factory: DocumentFactory):
+    """Test that a capped PDF source image holds the pixels of a render kept alive while read."""
+    content = (ASSETS_DIR / "test_single_pg_pdf.pdf").read_bytes()
+    page = factory.from_bytes(content, "doc.pdf", keep_source_images=True, source_max_dim=256).pages[0]
+
+    with fitz.open(stream=content, filetype="pdf") as doc:
+        pdf_page = doc[0]
+        zoom = min(get_config().image_dpi / 72, 256 / max(pdf_page.rect.width, pdf_page.rect.height))
+        pix, expected = factory._render_pdf_page(pdf_page, zoom)
+        assert np.array_equal(page.source_image, expected[..., ::-1])
+        del pix
+
+
 def test_config_defaults():
     """Test that configuration defaults are sensible."""
     # Reset config to defaults before checking
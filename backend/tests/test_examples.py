@@ -0,0 +1,16 @@
+"""Smoke tests for the scripts under examples/."""
+
+import importlib.util
+from pathlib import Path
+
+_EXAMPLES_DIR = Path(__file__).resolve().parents[2] / "examples"
+
+
+def test_volume_usage_example_imports():
+    """Test that the volume usage example imports against the current backend API."""
+    spec = importlib.util.spec_from_file_location("volume_usage", _EXAMPLES_DIR / "volume_usage.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert callable(module.example_using_classes)
+    assert callable(module.example_using_helper_functions)
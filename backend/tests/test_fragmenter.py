@@ -1,13 +1,21 @@
 """Tests for document fragmentation functionality."""
 
+from collections.abc import Iterator
+
 import cv2
 import numpy as np
+import pytest
 
 from backend.config import set_config_for_test
 from backend.documents.document import Page, PageFragment
 from backend.documents.fragmenter import Fragmenter
 
 
+def _bboxes_array(fragments: list[PageFragment]) -> np.ndarray:
+    """Stack fragment bounding boxes into an (N, 4) array of x1, y1, x2, y2 columns."""
+    return np.array([f.bbox for f in fragments], dtype=np.int64).reshape(-1, 4)
+
+
 class TestFragmenter:
     """Test the Fragmenter class."""
 
@@ -55,7 +63,7 @@ class TestFragmenter:
         # Should create multiple fragments
         assert len(fragments) > 0
         assert all(isinstance(f, PageFragment) for f in fragments)
-        assert all(len(f.bbox) == 4 for f in fragments)
+        assert _bboxes_array(fragments).shape == (len(fragments), 4)
         assert all(f.content for f in fragments)
 
     def test_tile_page_with_custom_tile_size(self):
@@ -69,10 +77,9 @@ class TestFragmenter:
         assert len(fragments) > 0
 
         # Check that fragments have appropriate dimensions
-        for fragment in fragments:
-            x1, y1, x2, y2 = fragment.bbox
-            assert x2 - x1 <= 50
-            assert y2 - y1 <= 50
+        bboxes = _bboxes_array(fragments)
+        assert np.all(bboxes[:, 2] - bboxes[:, 0] <= 50)
+        assert np.all(bboxes[:, 3] - bboxes[:, 1] <= 50)
 
     def test_tile_page_with_overlap(self):
         """Test fragmentation with overlap."""
@@ -108,10 +115,9 @@ class TestFragmenter:
         assert len(fragments) > 0
 
         # Check that bounding boxes are within image bounds
-        for fragment in fragments:
-            x1, y1, x2, y2 = fragment.bbox
-            assert 0 <= x1 < x2 <= 200
-            assert 0 <= y1 < y2 <= 200
+        x1, y1, x2, y2 = _bboxes_array(fragments).T
+        assert np.all((0 <= x1) & (x1 < x2) & (x2 <= 200))
+        assert np.all((0 <= y1) & (y1 < y2) & (y2 <= 200))
 
     def test_tile_page_small_image(self):
         """Test fragmentation with image smaller than tile size."""
@@ -124,10 +130,9 @@ class TestFragmenter:
         assert len(fragments) >= 1
 
         # Fragment should not exceed image dimensions
-        for fragment in fragments:
-            x1, y1, x2, y2 = fragment.bbox
-            assert x2 <= 50
-            assert y2 <= 50
+        bboxes = _bboxes_array(fragments)
+        assert np.all(bboxes[:, 2] <= 50)
+        assert np.all(bboxes[:, 3] <= 50)
 
     def test_tile_page_invalid_image(self):
         """Test fragmentation with invalid image data."""
@@ -140,6 +145,29 @@ class TestFragmenter:
         # Should return empty list for invalid image
         assert len(fragments) == 0
 
+    def test_tile_page_empty_content(self):
+        """Test fragmentation with empty page content."""
+        page = Page(page_number=1, content=b"")
+
+        fragments = Fragmenter.tile_page(page)
+
+        # Should return empty list without attempting to decode
+        assert fragments == []
+
+    def test_iter_tile_page_matches_tile_page(self):
+        """Test that the streaming variant yields the same fragments lazily."""
+        image_bytes = self._create_test_image(300, 300, "complex")
+        page = Page(page_number=1, content=image_bytes)
+
+        fragment_iter = Fragmenter.iter_tile_page(page)
+        assert isinstance(fragment_iter, Iterator)
+
+        streamed = list(fragment_iter)
+        fragments = Fragmenter.tile_page(page)
+
+        assert [f.bbox for f in streamed] == [f.bbox for f in fragments]
+        assert [f.content for f in streamed] == [f.content for f in fragments]
+
     def test_calculate_complexity_white_image(self):
         """Test complexity calculation for white image."""
         white_image = np.ones((100, 100, 3), dtype=np.uint8) * 255
@@ -169,6 +197,70 @@ class TestFragmenter:
         # Mixed image should have medium complexity
         assert 0.3 < complexity < 0.7
 
+    def test_tile_page_soa_matches_tile_page(self):
+        """Test that column-oriented fragmentation matches the list-based output."""
+        image_bytes = self._create_test_image(300, 300, "complex")
+        page = Page(page_number=1, content=image_bytes)
+
+        soa = Fragmenter.tile_page_soa(page)
+        fragments = Fragmenter.tile_page(page)
+
+        assert len(soa) == len(fragments)
+        assert soa.bboxes.dtype == np.int32
+        assert np.array_equal(soa.bboxes, _bboxes_array(fragments))
+        assert soa.contents == [f.content for f in fragments]
+        assert soa.complexities.shape == (len(fragments),)
+        assert np.all(soa.complexities >= 0.03)
+        assert soa[0].bbox == fragments[0].bbox
+
+    def test_tile_page_soa_invalid_image(self):
+        """Test column-oriented fragmentation with invalid image data."""
+        page = Page(page_number=1, content=b"not an image")
+
+        soa = Fragmenter.tile_page_soa(page)
+
+        assert len(soa) == 0
+        assert soa.bboxes.shape == (0, 4)
+
+    def test_interleaved_iter_tile_page_does_not_share_scratch(self):
+        """Test that concurrently open generators on one thread stay independent."""
+        complex_page = Page(page_number=1, content=self._create_test_image(300, 300, "complex"))
+        white_page = Page(page_number=2, content=self._create_test_image(300, 300, "white"))
+        expected = [f.bbox for f in Fragmenter.tile_page(complex_page)]
+
+        complex_iter = Fragmenter.iter_tile_page(complex_page)
+        first = next(complex_iter)
+        # Fragmenting another page mid-iteration must not clobber the first page's buffers
+        assert Fragmenter.tile_page(white_page) == []
+        rest = list(complex_iter)
+
+        assert [f.bbox for f in [first, *rest]] == expected
+
+    def test_non_white_integral_reuses_scratch(self):
+        """Test that the integral is written into pooled buffers when provided."""
+        image = np.full((60, 80, 3), 255, dtype=np.uint8)
+        image[:30] = 0
+        scratch: dict[str, np.ndarray] = {}
+
+        first = Fragmenter._non_white_integral(image, scratch)
+        integral_buffer = scratch["integral"]
+        second = Fragmenter._non_white_integral(image[:40, :50], scratch)
+
+        assert scratch["integral"] is integral_buffer
+        assert np.shares_memory(second, integral_buffer)
+        assert first.shape == (61, 81)
+        assert second[-1, -1] == 30 * 50
+
+    def test_integral_complexity_matches_calculate_complexity(self):
+        """Test that the summed-area lookup agrees with the per-tile calculation."""
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+        integral = Fragmenter._non_white_integral(image)
+
+        for x1, y1, x2, y2 in [(0, 0, 160, 120), (10, 20, 60, 80), (100, 50, 160, 120)]:
+            expected = Fragmenter._calculate_complexity(image[y1:y2, x1:x2])
+            assert Fragmenter._integral_complexity(integral, x1, y1, x2, y2) == pytest.approx(expected)
+
     def test_calculate_complexity_empty_image(self):
         """Test complexity calculation for empty image."""
         empty_image = np.array([])
@@ -206,10 +298,9 @@ class TestFragmenter:
         assert len(fragments) > 0
 
         # Check that fragments respect the configured tile size
-        for fragment in fragments:
-            x1, y1, x2, y2 = fragment.bbox
-            assert x2 - x1 <= 75
-            assert y2 - y1 <= 75
+        bboxes = _bboxes_array(fragments)
+        assert np.all(bboxes[:, 2] - bboxes[:, 0] <= 75)
+        assert np.all(bboxes[:, 3] - bboxes[:, 1] <= 75)
 
     def test_fragment_content_is_valid_jpeg(self):
         """Test that fragment content is valid JPEG data."""
@@ -230,6 +321,23 @@ class TestFragmenter:
             assert decoded.shape[0] > 0
             assert decoded.shape[1] > 0
 
+    def test_fragment_content_preserves_channel_order(self):
+        """Test that tiles are re-encoded without swapping color channels."""
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        image[:, :, 2] = 255  # Pure red in BGR order
+        success, encoded = cv2.imencode(".jpg", image)
+        assert success
+        page = Page(page_number=1, content=encoded.tobytes())
+
+        fragments = Fragmenter.tile_page(page, tile_size=(50, 50), complexity_threshold=0.0)
+
+        assert len(fragments) > 0
+        for fragment in fragments:
+            decoded = cv2.imdecode(np.frombuffer(fragment.content, np.uint8), cv2.IMREAD_COLOR)
+            blue, green, red = decoded.reshape(-1, 3).mean(axis=0)
+            assert red > 200
+            assert blue < 50
+
     def test_bbox_coordinates_are_correct(self):
         """Test that bounding box coordinates are correct."""
         image_bytes = self._create_test_image(150, 150, "complex")
@@ -238,14 +346,13 @@ class TestFragmenter:
         fragments = Fragmenter.tile_page(page, tile_size=(50, 50), overlap_ratio=0.0)
 
         # Check that bounding boxes are non-overlapping and within image bounds
-        for fragment in fragments:
-            x1, y1, x2, y2 = fragment.bbox
-            assert x1 >= 0
-            assert y1 >= 0
-            assert x2 <= 150
-            assert y2 <= 150
-            assert x1 < x2
-            assert y1 < y2
+        x1, y1, x2, y2 = _bboxes_array(fragments).T
+        assert np.all(x1 >= 0)
+        assert np.all(y1 >= 0)
+        assert np.all(x2 <= 150)
+        assert np.all(y2 <= 150)
+        assert np.all(x1 < x2)
+        assert np.all(y1 < y2)
 
 
 class TestPageIntegration:
@@ -314,6 +421,30 @@ class TestPageIntegration:
         assert len(fragments) > 0
         assert len(page.fragments) == len(fragments)
 
+    def test_page_fragment_method_stream(self):
+        """Test that Page.fragment(stream=True) yields fragments without storing them."""
+        image_bytes = self._create_test_image(300, 300, "complex")
+        page = Page(page_number=1, content=image_bytes)
+
+        fragments = list(page.fragment(stream=True))
+
+        assert len(fragments) > 0
+        assert all(isinstance(f, PageFragment) for f in fragments)
+        assert page.fragments == []
+
+    def test_page_fragment_soa_method(self):
+        """Test that Page.fragment_soa() populates column-oriented storage."""
+        image_bytes = self._create_test_image(300, 300, "complex")
+        page = Page(page_number=1, content=image_bytes)
+
+        assert page.fragments_soa is None
+
+        soa = page.fragment_soa(tile_size=(100, 100))
+
+        assert page.fragments_soa is soa
+        assert len(soa) > 0
+        assert all(isinstance(f, PageFragment) for f in soa)
+
     def test_integration_workflow(self):
         """Test complete integration workflow."""
         # Create a page
@@ -328,8 +459,6 @@ class TestPageIntegration:
         assert len(page.fragments) == len(fragments)
 
         # 3. Verify bounding boxes are accessible
-        for fragment in page.fragments:
-            assert len(fragment.bbox) == 4
-            x1, y1, x2, y2 = fragment.bbox
-            assert x1 >= 0 and y1 >= 0
-            assert x2 > x1 and y2 > y1
+        x1, y1, x2, y2 = _bboxes_array(page.fragments).T
+        assert np.all((x1 >= 0) & (y1 >= 0))
+        assert np.all((x2 > x1) & (y2 > y1))
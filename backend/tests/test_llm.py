@@ -1,15 +1,49 @@
 """Tests for LLM functionality."""
 
 import pytest
-from unittest.mock import Mock, patch, mock_open
+import re
+from unittest.mock import Mock, call, patch, mock_open
 from backend.llm.openai_client import OpenAIClient
 from backend.llm.prompt_loader import load_prompt
 from backend.llm.document_parser import DocumentParser
 from backend.documents.document import Page, Document
 from backend.config import set_config_for_test
+from backend.tests._fixtures import OPENAI_TEST_CONFIG, TINY_PNG_BYTES, tiny_png_page
 from pathlib import Path
 
 
+# Expected error messages, compiled once for pytest.raises(match=...)
+_ERR_NO_URL = re.compile("OpenAI base URL is required")
+_ERR_NO_KEY = re.compile("OpenAI API key is required")
+_ERR_REQUEST_FAILED = re.compile("OpenAI API request failed")
+_ERR_PROMPT_NOT_FOUND = re.compile("Prompt file not found")
+_ERR_PROMPT_READ = re.compile("Error reading prompt file")
+_ERR_EMPTY_PAGE = re.compile("Page 1 has no content to parse")
+
+# Pages shared by the parse_page tests; parse_page only reads them
+PAGE_EMPTY = Page(page_number=1, content=b"")
+PAGE_TEXT = Page(page_number=1, content=b"test content")
+PAGE_PNG = Page(page_number=1, content=TINY_PNG_BYTES)
+
+# Messages parse_page sends for PAGE_PNG with the stub "FAKE" encoder
+_EXPECTED_MESSAGES = [
+    {"role": "system", "content": "System prompt"},
+    {
+        "role": "user",
+        "content": [
+            {
+                "type": "text",
+                "text": "Please analyze this P&ID diagram (page 1) and extract all the information according to the system prompt."
+            },
+            {
+                "type": "image_url",
+                "image_url": {"url": "data:image/png;base64,FAKE", "detail": "high"}
+            }
+        ]
+    }
+]
+
+
 @pytest.fixture(autouse=True)
 def clear_env(monkeypatch):
     """Clear environment variables before each test."""
@@ -19,57 +53,73 @@ def clear_env(monkeypatch):
         monkeypatch.delenv(var, raising=False)
 
 
+@pytest.fixture(autouse=True)
+def clear_prompt_cache():
+    """Clear the prompt cache so each test reads prompt files afresh."""
+    load_prompt.cache_clear()
+
+
+# Canned chat completion payloads returned by the mocked requests.post
+_FAKE_OPENAI_OK = {"choices": [{"message": {"content": "Test response"}}]}
+_FAKE_OPENAI_EMPTY = {"choices": [{"message": {"content": ""}}]}
+
+
+def _empty_completion_response():
+    """Build a response mock carrying an empty chat completion."""
+    response = Mock()
+    response.json.return_value = _FAKE_OPENAI_EMPTY
+    return response
+
+
+@pytest.fixture(autouse=True, scope="class")
+def _block_requests():
+    """Patch requests.post once per test class so no real HTTP request can fire."""
+    with patch('backend.llm.openai_client.requests.post') as mock_post:
+        yield mock_post
+
+
+@pytest.fixture
+def mock_post(_block_requests):
+    """Return the class-wide requests.post mock, reset for this test."""
+    _block_requests.reset_mock(return_value=True, side_effect=True)
+    _block_requests.return_value = _empty_completion_response()
+    return _block_requests
+
+
+@pytest.fixture
+def openai_config(request):
+    """Override fields of the module's default config via indirect parametrization."""
+    set_config_for_test(**{**OPENAI_TEST_CONFIG, **getattr(request, "param", {})})
+    yield
+    # Put the module default back for the tests that rely on it
+    set_config_for_test(**OPENAI_TEST_CONFIG)
+
+
 class TestOpenAIClient:
     """Test cases for OpenAIClient."""
     
     def test_init_with_config(self):
         """Test OpenAIClient initialization with valid config."""
-        set_config_for_test(
-            openai_base_url="https://api.openai.com/v1",
-            openai_api_key="test-key",
-            openai_model="gpt-4o",
-            openai_temperature=0.2,
-            openai_max_tokens=5000
-        )
         client = OpenAIClient()
         assert client.base_url == "https://api.openai.com/v1"
         assert client.api_key == "test-key"
     
-    def test_init_missing_base_url(self):
+    @pytest.mark.parametrize("openai_config", [{"openai_base_url": None}], indirect=True)
+    def test_init_missing_base_url(self, openai_config):
         """Test OpenAIClient initialization fails without base URL."""
-        set_config_for_test(
-            openai_base_url=None,
-            openai_api_key="test-key"
-        )
-        with pytest.raises(ValueError, match="OpenAI base URL is required"):
+        with pytest.raises(ValueError, match=_ERR_NO_URL):
             OpenAIClient()
     
-    def test_init_missing_api_key(self):
+    @pytest.mark.parametrize("openai_config", [{"openai_api_key": None}], indirect=True)
+    def test_init_missing_api_key(self, openai_config):
         """Test OpenAIClient initialization fails without API key."""
-        set_config_for_test(
-            openai_base_url="https://api.openai.com/v1",
-            openai_api_key=None
-        )
-        with pytest.raises(ValueError, match="OpenAI API key is required"):
+        with pytest.raises(ValueError, match=_ERR_NO_KEY):
             OpenAIClient()
     
-    @patch('backend.llm.openai_client.requests.post')
     def test_chat_completion_success(self, mock_post):
         """Test successful chat completion."""
         # Setup
-        set_config_for_test(
-            openai_base_url="https://api.openai.com/v1",
-            openai_api_key="test-key",
-            openai_model="gpt-4o",
-            openai_temperature=0.2,
-            openai_max_tokens=5000
-        )
-        
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "choices": [{"message": {"content": "Test response"}}]
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value.json.return_value = _FAKE_OPENAI_OK
         
         client = OpenAIClient()
         messages = [{"role": "user", "content": "Test message"}]
@@ -86,15 +136,9 @@ class TestOpenAIClient:
         assert call_args[1]["json"]["temperature"] == 0.2
         assert call_args[1]["json"]["max_tokens"] == 5000
     
-    @patch('backend.llm.openai_client.requests.post')
     def test_chat_completion_request_error(self, mock_post):
         """Test chat completion with request error."""
         # Setup
-        set_config_for_test(
-            openai_base_url="https://api.openai.com/v1",
-            openai_api_key="test-key"
-        )
-        
         import requests
         mock_post.side_effect = requests.exceptions.RequestException("Network error")
         
@@ -102,7 +146,7 @@ class TestOpenAIClient:
         messages = [{"role": "user", "content": "Test message"}]
         
         # Test
-        with pytest.raises(RuntimeError, match="OpenAI API request failed"):
+        with pytest.raises(RuntimeError, match=_ERR_REQUEST_FAILED):
             client.chat_completion(messages)
 
 
@@ -118,46 +162,48 @@ class TestPromptLoader:
         assert "You are a highly accurate and detail-oriented engineering assistant" in result
         assert "P&ID" in result
     
+    def test_load_prompt_is_cached(self):
+        """Test that repeated loads of the same prompt are served from cache."""
+        first = load_prompt("extract_data")
+        
+        with patch('builtins.open', side_effect=AssertionError("prompt re-read from disk")):
+            second = load_prompt("extract_data")
+        
+        assert second is first
+    
     def test_load_prompt_file_not_found(self):
         """Test prompt loading when file doesn't exist."""
         # Test with a non-existent prompt file
-        with pytest.raises(FileNotFoundError, match="Prompt file not found"):
+        with pytest.raises(FileNotFoundError, match=_ERR_PROMPT_NOT_FOUND):
             load_prompt("nonexistent_prompt")
     
-    @patch('builtins.open', new_callable=mock_open)
-    def test_load_prompt_read_error(self, mock_file):
+    def test_load_prompt_read_error(self):
         """Test prompt loading with read error."""
-        # Setup the mock to raise an exception when reading
-        mock_file.return_value.read.side_effect = Exception("Read error")
-        
-        # Test with a known prompt file that exists
-        with pytest.raises(RuntimeError, match="Error reading prompt file"):
-            load_prompt("extract_data")
+        # Test with a known prompt file that exists, patching open only around the call
+        with patch('builtins.open', mock_open()) as mock_file:
+            mock_file.return_value.read.side_effect = Exception("Read error")
+            with pytest.raises(RuntimeError, match=_ERR_PROMPT_READ):
+                load_prompt("extract_data")
 
 
 class TestDocumentParser:
     """Test cases for DocumentParser."""
     
-    def test_init(self):
+    def test_init(self, mock_client):
         """Test DocumentParser initialization."""
-        mock_client = Mock(spec=OpenAIClient)
         parser = DocumentParser(mock_client)
         assert parser.openai_client == mock_client
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_page_success(self, mock_load_prompt):
+    def test_parse_page_success(self, mock_load_prompt, mock_client):
         """Test successful page parsing."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         mock_client.chat_completion.return_value = "Parsed content"
         mock_load_prompt.return_value = "System prompt"
         
-        parser = DocumentParser(mock_client)
-        # Create page with sample image content (fake PNG bytes)
-        page = Page(page_number=1, content=b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82')
-        
-        # Test
-        result = parser.parse_page(page)
+        # Test with a stub encoder; the real base64 output is irrelevant here
+        parser = DocumentParser(mock_client, b64_encoder=lambda content: b"FAKE")
+        result = parser.parse_page(PAGE_PNG)
         
         # Verify
         assert result == "Parsed content"
@@ -165,77 +211,49 @@ class TestDocumentParser:
         mock_client.chat_completion.assert_called_once()
         
         # Check the messages passed to chat_completion
-        call_args = mock_client.chat_completion.call_args[0][0]
-        assert len(call_args) == 2
-        assert call_args[0]["role"] == "system"
-        assert call_args[0]["content"] == "System prompt"
-        assert call_args[1]["role"] == "user"
-        assert "content" in call_args[1]
-        assert isinstance(call_args[1]["content"], list)
-        assert len(call_args[1]["content"]) == 2
-        # Check text content
-        assert call_args[1]["content"][0]["type"] == "text"
-        assert "page 1" in call_args[1]["content"][0]["text"]
-        # Check image content
-        assert call_args[1]["content"][1]["type"] == "image_url"
-        assert "data:image/png;base64," in call_args[1]["content"][1]["image_url"]["url"]
+        assert mock_client.chat_completion.call_args == call(_EXPECTED_MESSAGES)
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_page_prompt_not_found(self, mock_load_prompt):
+    def test_parse_page_prompt_not_found(self, mock_load_prompt, parser):
         """Test page parsing when prompt file is not found."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         mock_load_prompt.side_effect = FileNotFoundError("Prompt not found")
         
-        parser = DocumentParser(mock_client)
-        page = Page(page_number=1, content=b"test content")
-        
         # Test
         with pytest.raises(FileNotFoundError):
-            parser.parse_page(page)
+            parser.parse_page(PAGE_TEXT)
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_page_empty_content(self, mock_load_prompt):
+    def test_parse_page_empty_content(self, mock_load_prompt, parser):
         """Test page parsing with empty content."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         mock_load_prompt.return_value = "System prompt"
         
-        parser = DocumentParser(mock_client)
-        page = Page(page_number=1, content=b"")  # Empty content
-        
         # Test
-        with pytest.raises(ValueError, match="Page 1 has no content to parse"):
-            parser.parse_page(page)
+        with pytest.raises(ValueError, match=_ERR_EMPTY_PAGE):
+            parser.parse_page(PAGE_EMPTY)
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_page_llm_error(self, mock_load_prompt):
+    def test_parse_page_llm_error(self, mock_load_prompt, mock_client, parser):
         """Test page parsing when LLM call fails."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         mock_client.chat_completion.side_effect = Exception("LLM error")
         mock_load_prompt.return_value = "System prompt"
         
-        parser = DocumentParser(mock_client)
-        page = Page(page_number=1, content=b"test content")
-        
         # Test
         with pytest.raises(Exception, match="LLM error"):
-            parser.parse_page(page)
+            parser.parse_page(PAGE_TEXT)
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_document_success(self, mock_load_prompt):
+    def test_parse_document_success(self, mock_load_prompt, mock_client, parser):
         """Test successful document parsing."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         mock_client.chat_completion.side_effect = ["Page 1 result", "Page 2 result"]
         mock_load_prompt.return_value = "System prompt"
         
-        parser = DocumentParser(mock_client)
-        
         # Create document with two pages
-        page1 = Page(page_number=1, content=b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82')
-        page2 = Page(page_number=2, content=b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82')
+        page1 = tiny_png_page(1)
+        page2 = tiny_png_page(2)
         document = Document(path=Path("/test/document.pdf"), pages=[page1, page2])
         
         # Test
@@ -247,13 +265,11 @@ class TestDocumentParser:
         assert mock_load_prompt.call_count == 2
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_document_empty_pages(self, mock_load_prompt):
+    def test_parse_document_empty_pages(self, mock_load_prompt, mock_client, parser):
         """Test document parsing with no pages."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         mock_load_prompt.return_value = "System prompt"
         
-        parser = DocumentParser(mock_client)
         document = Document(path=Path("/test/document.pdf"), pages=[])
         
         # Test
@@ -264,19 +280,16 @@ class TestDocumentParser:
         mock_client.chat_completion.assert_not_called()
     
     @patch('backend.llm.document_parser.load_prompt')
-    def test_parse_document_with_page_error(self, mock_load_prompt):
+    def test_parse_document_with_page_error(self, mock_load_prompt, mock_client, parser):
         """Test document parsing when one page fails."""
         # Setup
-        mock_client = Mock(spec=OpenAIClient)
         # First page succeeds, second page fails
         mock_client.chat_completion.side_effect = ["Page 1 result", Exception("Page 2 error")]
         mock_load_prompt.return_value = "System prompt"
         
-        parser = DocumentParser(mock_client)
-        
         # Create document with two pages
-        page1 = Page(page_number=1, content=b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82')
-        page2 = Page(page_number=2, content=b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82')
+        page1 = tiny_png_page(1)
+        page2 = tiny_png_page(2)
         document = Document(path=Path("/test/document.pdf"), pages=[page1, page2])
         
         # Test
@@ -1,20 +1,32 @@
 import pytest
+import backend.logging as blog
 from backend.logging import get_logger
 from backend.config import get_config
 
+@pytest.fixture
+def restore_log_level():
+    """Restore the configured log level and sink after the test."""
+    config = get_config()
+    previous = config.log_level
+    yield
+    config.log_level = previous
+    blog.set_level(previous)
+
 class TestLogging:
-    def test_log_level_from_config(self):
+    def test_log_level_from_config(self, restore_log_level, capsys):
         """Test that logger uses log level from AppConfig."""
         config = get_config()
         config.log_level = "WARNING"
-        from importlib import reload
-        import backend.logging as blog
-        reload(blog)
-        logger = blog.get_logger("test")
+        blog.set_level(config.log_level)
+        logger = blog.logger.bind(name="test")
         assert config.log_level.upper() == "WARNING"
+        assert blog.get_level() == "WARNING"
         # Should log at WARNING but not at INFO
         logger.warning("This is a warning.")
         logger.info("This info should not appear if loguru is configured correctly.")
+        out = capsys.readouterr().out
+        assert "This is a warning." in out
+        assert "This info should not appear" not in out
 
     def test_logger_is_singleton(self):
         """Test that get_logger returns the same logger instance for the same name."""
@@ -1,19 +1,41 @@
 import pytest
-import tempfile
-import os
-from unittest.mock import MagicMock
+import io
+import itertools
+from types import SimpleNamespace
+from unittest.mock import call, mock_open, patch
+from databricks.sdk.errors import NotFound, PermissionDenied
 from backend.databricks.volume import (
     Volume,
     VolumeFileStore,
     create_volume_from_config,
     create_volume_file_store_from_config,
 )
-from backend.config import set_config_for_test
+from backend.config import reset_config_for_test, set_config_for_test
 from backend.exceptions import FileAlreadyExistsError, FileNotFoundError, VolumeUploadError
+from backend.tests._fixtures import StubClient
+
+
+# Validated once; tests only read it
+_TEST_VOLUME = Volume(catalog="test_catalog", schema_name="test_schema", volume_name="test_volume")
+
+
+@pytest.fixture(scope="module")
+def volume():
+    return _TEST_VOLUME
+
+
+@pytest.fixture(scope="module")
+def mock_client():
+    return StubClient()
+
+
+@pytest.fixture(scope="module")
+def file_store(volume, mock_client):
+    return VolumeFileStore(volume, mock_client)
 
 
 class TestVolume:
-    """Test the Volume pydantic model."""
+    """Test the Volume pydantic dataclass."""
 
     def test_volume_creation(self):
         """Test creating a Volume instance."""
@@ -24,18 +46,26 @@ class TestVolume:
 
     def test_get_full_name(self):
         """Test the get_full_name method."""
-        volume = Volume(catalog="catalog", schema_name="schema", volume_name="volume")
-        assert volume.get_full_name() == "catalog.schema.volume"
+        assert _TEST_VOLUME.get_full_name() == "test_catalog.test_schema.test_volume"
 
     def test_get_volume_path(self):
         """Test the get_volume_path method."""
-        volume = Volume(catalog="catalog", schema_name="schema", volume_name="volume")
-        assert volume.get_volume_path() == "/Volumes/catalog/schema/volume"
+        assert _TEST_VOLUME.get_volume_path() == "/Volumes/test_catalog/test_schema/test_volume"
 
     def test_get_file_path(self):
         """Test the get_file_path method."""
-        volume = Volume(catalog="catalog", schema_name="schema", volume_name="volume")
-        assert volume.get_file_path("test.txt") == "/Volumes/catalog/schema/volume/test.txt"
+        assert _TEST_VOLUME.get_file_path("test.txt") == "/Volumes/test_catalog/test_schema/test_volume/test.txt"
+
+    def test_path_properties_are_cached(self):
+        """Test that the derived names are computed once and reused."""
+        volume = Volume(catalog="test_catalog", schema_name="test_schema", volume_name="test_volume")
+        assert volume.full_name is volume.full_name
+        assert volume.volume_path is volume.get_volume_path()
+
+    def test_volume_is_frozen(self):
+        """Test that a Volume's identity cannot be changed after creation."""
+        with pytest.raises(AttributeError):
+            _TEST_VOLUME.catalog = "other_catalog"
 
     def test_volume_validation(self):
         """Test that Volume validates required fields."""
@@ -46,17 +76,17 @@ class TestVolume:
 class TestVolumeFileStore:
     """Test the VolumeFileStore class."""
 
-    @pytest.fixture
-    def volume(self):
-        return Volume(catalog="test_catalog", schema_name="test_schema", volume_name="test_volume")
+    @pytest.fixture(autouse=True)
+    def _reset(self, mock_client):
+        """Clear calls and configured behaviour left on the shared client by earlier tests."""
+        mock_client.reset_mock()
 
     @pytest.fixture
-    def mock_client(self):
-        return MagicMock()
-
-    @pytest.fixture
-    def file_store(self, volume, mock_client):
-        return VolumeFileStore(volume, mock_client)
+    def fake_local_file(self, monkeypatch):
+        """Pretend a local file exists without touching the filesystem."""
+        path = "/fake/file.txt"
+        monkeypatch.setattr("backend.databricks.volume.local_file_exists", lambda p: p == path)
+        return path
 
     def test_volume_file_store_creation(self, volume, mock_client):
         """Test creating a VolumeFileStore instance."""
@@ -64,94 +94,134 @@ class TestVolumeFileStore:
         assert file_store.volume == volume
         assert file_store.client == mock_client
 
-    def test_volume_exists_true(self, file_store):
-        """Test volume_exists returns True when volume exists."""
-        file_store.client.volumes.read.return_value = MagicMock()
-        assert file_store.volume_exists() is True
+    @pytest.mark.parametrize("read_error, expected", [(None, True), (NotFound("Not found"), False)])
+    def test_volume_exists(self, file_store, read_error, expected):
+        """Test volume_exists reflects whether the volume can be read."""
+        if read_error is None:
+            file_store.client.volumes.read.return_value = SimpleNamespace()
+        else:
+            file_store.client.volumes.read.side_effect = read_error
+
+        assert file_store.volume_exists() is expected
         file_store.client.volumes.read.assert_called_once_with(name="test_catalog.test_schema.test_volume")
 
-    def test_volume_exists_false(self, file_store):
-        """Test volume_exists returns False when volume doesn't exist."""
-        file_store.client.volumes.read.side_effect = Exception("Not found")
-        assert file_store.volume_exists() is False
+    @pytest.mark.parametrize(
+        "listing, expected",
+        [
+            (
+                [
+                    SimpleNamespace(path="/Volumes/test_catalog/test_schema/test_volume/file1.txt"),
+                    SimpleNamespace(path="/Volumes/test_catalog/test_schema/test_volume/file2.txt"),
+                ],
+                [
+                    "/Volumes/test_catalog/test_schema/test_volume/file1.txt",
+                    "/Volumes/test_catalog/test_schema/test_volume/file2.txt",
+                ],
+            ),
+            # Listing errors are swallowed and reported as an empty volume
+            (Exception("Error"), []),
+        ],
+    )
+    def test_list_files(self, file_store, listing, expected):
+        """Test list_files returns file paths, or an empty list on error."""
+        if isinstance(listing, Exception):
+            file_store.client.files.list_directory_contents.side_effect = listing
+        else:
+            file_store.client.files.list_directory_contents.return_value = listing
+
+        assert file_store.list_files() == expected
+        file_store.client.files.list_directory_contents.assert_called_once_with("/Volumes/test_catalog/test_schema/test_volume")
 
-    def test_list_files_success(self, file_store):
-        """Test list_files returns file paths when successful."""
-        mock_file1 = MagicMock(path="/Volumes/test_catalog/test_schema/test_volume/file1.txt")
-        mock_file2 = MagicMock(path="/Volumes/test_catalog/test_schema/test_volume/file2.txt")
-        file_store.client.files.list_directory_contents.return_value = [mock_file1, mock_file2]
+    def test_volume_exists_reraises_auth_error(self, file_store):
+        """Test that volume_exists does not report auth failures as a missing volume."""
+        file_store.client.volumes.read.side_effect = PermissionDenied("Forbidden")
+        with pytest.raises(PermissionDenied):
+            file_store.volume_exists()
 
-        files = file_store.list_files()
-        assert files == [mock_file1.path, mock_file2.path]
-        file_store.client.files.list_directory_contents.assert_called_once_with("/Volumes/test_catalog/test_schema/test_volume")
+    def test_list_files_iter_lazy(self, file_store):
+        """Test list_files_iter only pulls as many entries as are consumed."""
+        pulled = []
+
+        def listing():
+            for i in range(100):
+                pulled.append(i)
+                yield SimpleNamespace(path=f"/Volumes/test_catalog/test_schema/test_volume/file{i}.txt")
+
+        file_store.client.files.list_directory_contents.return_value = listing()
 
-    def test_list_files_error(self, file_store):
-        """Test list_files returns empty list on error."""
-        file_store.client.files.list_directory_contents.side_effect = Exception("Error")
-        files = file_store.list_files()
-        assert files == []
+        first_two = list(itertools.islice(file_store.list_files_iter(), 2))
+
+        assert first_two == [
+            "/Volumes/test_catalog/test_schema/test_volume/file0.txt",
+            "/Volumes/test_catalog/test_schema/test_volume/file1.txt",
+        ]
+        assert pulled == [0, 1]
 
     def test_file_exists_true(self, file_store):
         """Test file_exists returns True when file exists."""
-        file_store.client.files.get_metadata.return_value = MagicMock()
+        file_store.client.files.get_metadata.return_value = SimpleNamespace()
         assert file_store.file_exists("test.txt") is True
         file_store.client.files.get_metadata.assert_called_once_with("/Volumes/test_catalog/test_schema/test_volume/test.txt")
 
     def test_file_exists_false(self, file_store):
         """Test file_exists returns False when file doesn't exist."""
-        file_store.client.files.get_metadata.side_effect = Exception("Not found")
+        file_store.client.files.get_metadata.side_effect = NotFound("Not found")
         assert file_store.file_exists("test.txt") is False
 
-    def test_upload_file_with_destination_filename(self, file_store):
-        """Test that upload_file uses destination_filename when provided."""
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, prefix="tmptest_", suffix="_original.txt") as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
-
-        try:
-            # Mock file_exists to return False (file doesn't exist)
-            file_store.client.files.get_metadata.side_effect = Exception("Not found")
-
-            # Call upload_file with destination_filename
-            result = file_store.upload_file(tmp_file_path, destination_filename="custom_name.txt")
-
-            # Verify the upload was called with the custom filename
-            expected_volume_path = "/Volumes/test_catalog/test_schema/test_volume/custom_name.txt"
-            file_store.client.files.upload.assert_called_once()
-            args = file_store.client.files.upload.call_args
-            assert args[0][0] == expected_volume_path  # First positional argument should be the volume path
-            assert result is True
-
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
-
-    def test_upload_file_without_destination_filename(self, file_store):
-        """Test that upload_file uses basename of file_path when destination_filename is not provided."""
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, prefix="tmptest_", suffix="_original.txt") as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
-
-        try:
-            # Mock file_exists to return False (file doesn't exist)
-            file_store.client.files.get_metadata.side_effect = Exception("Not found")
-
-            # Call upload_file without destination_filename
-            result = file_store.upload_file(tmp_file_path)
-
-            # Verify the upload was called with the basename of the temp file
-            expected_filename = os.path.basename(tmp_file_path)
-            expected_volume_path = f"/Volumes/test_catalog/test_schema/test_volume/{expected_filename}"
-            file_store.client.files.upload.assert_called_once()
-            args = file_store.client.files.upload.call_args
-            assert args[0][0] == expected_volume_path  # First positional argument should be the volume path
-            assert result is True
-
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
+    def test_file_exists_reraises_auth_error(self, file_store):
+        """Test that file_exists does not report auth failures as a missing file."""
+        file_store.client.files.get_metadata.side_effect = PermissionDenied("Forbidden")
+        with pytest.raises(PermissionDenied):
+            file_store.file_exists("test.txt")
+
+    @pytest.mark.parametrize(
+        "destination, overwrite, exists, expected_filename",
+        [
+            # destination_filename is used when provided
+            ("custom_name.txt", False, False, "custom_name.txt"),
+            # basename of the local path is used otherwise
+            (None, False, False, "file.txt"),
+            # an existing file is replaced when overwrite=True
+            ("existing.txt", True, True, "existing.txt"),
+        ],
+    )
+    def test_upload_file_success(self, file_store, fake_local_file, destination, overwrite, exists, expected_filename):
+        """Test that upload_file uploads to the expected volume path."""
+        # Mock file_exists via get_metadata
+        if exists:
+            file_store.client.files.get_metadata.return_value = SimpleNamespace()
+        else:
+            file_store.client.files.get_metadata.side_effect = NotFound("Not found")
+
+        result = file_store.upload_file(fake_local_file, overwrite=overwrite, destination_filename=destination)
+
+        assert result is True
+        file_store.client.files.upload_from.assert_called_once()
+        args = file_store.client.files.upload_from.call_args
+        # The SDK is given the volume path and reads the local file itself
+        assert args[0] == (f"/Volumes/test_catalog/test_schema/test_volume/{expected_filename}", fake_local_file)
+        assert args[1]["overwrite"] is overwrite
+
+    def test_upload_file_overwrite_skips_exists_check(self, file_store, fake_local_file):
+        """Test that upload_file does not query the volume when overwrite=True."""
+        assert file_store.upload_file(fake_local_file, overwrite=True) is True
+        file_store.client.files.get_metadata.assert_not_called()
+        file_store.client.files.upload_from.assert_called_once()
+
+    def test_upload_file_assume_exists_true_raises_without_rpc(self, file_store, fake_local_file):
+        """Test that assume_exists=True refuses the upload without a metadata lookup."""
+        with pytest.raises(FileAlreadyExistsError):
+            file_store.upload_file(fake_local_file, assume_exists=True)
+
+        file_store.client.files.upload_from.assert_not_called()
+        file_store.client.files.get_metadata.assert_not_called()
+
+    def test_upload_file_assume_exists_false_uploads_without_lookup(self, file_store, fake_local_file):
+        """Test that assume_exists=False uploads without a metadata lookup."""
+        assert file_store.upload_file(fake_local_file, assume_exists=False) is True
+
+        file_store.client.files.upload_from.assert_called_once()
+        file_store.client.files.get_metadata.assert_not_called()
 
     def test_upload_file_raises_file_not_found_error(self, file_store):
         """Test that upload_file raises FileNotFoundError for non-existent local files."""
@@ -161,126 +231,139 @@ class TestVolumeFileStore:
         assert exc_info.value.file_path == "/nonexistent/file.txt"
         assert "does not exist" in str(exc_info.value)
 
-    def test_upload_file_raises_file_already_exists_error(self, file_store):
+    def test_upload_file_raises_file_already_exists_error(self, file_store, fake_local_file):
         """Test that upload_file raises FileAlreadyExistsError when file exists and overwrite=False."""
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
-
-        try:
-            # Mock file_exists to return True (file exists)
-            file_store.client.files.get_metadata.return_value = MagicMock()
-
-            # Call upload_file with overwrite=False (default)
-            with pytest.raises(FileAlreadyExistsError) as exc_info:
-                file_store.upload_file(tmp_file_path, destination_filename="existing.txt")
-
-            assert exc_info.value.filename == "existing.txt"
-            assert exc_info.value.volume_name == "test_volume"
-            assert "already exists" in str(exc_info.value)
-
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
-
-    def test_upload_file_succeeds_with_overwrite(self, file_store):
-        """Test that upload_file succeeds when file exists but overwrite=True."""
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
-
-        try:
-            # Mock file_exists to return True (file exists)
-            file_store.client.files.get_metadata.return_value = MagicMock()
-
-            # Call upload_file with overwrite=True
-            result = file_store.upload_file(tmp_file_path, overwrite=True, destination_filename="existing.txt")
-
-            # Should succeed and return True
-            assert result is True
-            file_store.client.files.upload.assert_called_once()
-
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
-
-    def test_upload_file_raises_volume_upload_error(self, file_store):
+        # Mock file_exists to return True (file exists)
+        file_store.client.files.get_metadata.return_value = SimpleNamespace()
+
+        # Call upload_file with overwrite=False (default)
+        with pytest.raises(FileAlreadyExistsError) as exc_info:
+            file_store.upload_file(fake_local_file, destination_filename="existing.txt")
+
+        assert exc_info.value.filename == "existing.txt"
+        assert exc_info.value.volume_name == "test_volume"
+        assert "already exists" in str(exc_info.value)
+
+    def test_upload_file_raises_volume_upload_error(self, file_store, fake_local_file):
         """Test that upload_file raises VolumeUploadError when upload fails."""
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
+        # Mock file_exists to return False (file doesn't exist)
+        file_store.client.files.get_metadata.side_effect = NotFound("Not found")
+
+        # Mock upload to raise an exception
+        upload_error = Exception("Network timeout")
+        file_store.client.files.upload_from.side_effect = upload_error
+
+        # Call upload_file
+        with pytest.raises(VolumeUploadError) as exc_info:
+            file_store.upload_file(fake_local_file, destination_filename="test.txt")
+
+        assert exc_info.value.file_path == fake_local_file
+        assert "test.txt" in exc_info.value.volume_path
+        assert exc_info.value.original_error is upload_error
+        assert "Network timeout" in str(exc_info.value)
 
-        try:
-            # Mock file_exists to return False (file doesn't exist)
-            file_store.client.files.get_metadata.side_effect = Exception("Not found")
+    def test_upload_bytes_streams_file_object(self, file_store):
+        """Test that upload_bytes passes a file-like object straight to the Files API."""
+        file_store.client.files.get_metadata.side_effect = NotFound("Not found")
+        stream = io.BytesIO(b"test content")
+
+        result = file_store.upload_bytes(stream, destination_filename="streamed.txt")
+
+        assert result is True
+        file_store.client.files.upload.assert_called_once_with(
+            "/Volumes/test_catalog/test_schema/test_volume/streamed.txt", stream, overwrite=False
+        )
 
-            # Mock upload to raise an exception
-            upload_error = Exception("Network timeout")
-            file_store.client.files.upload.side_effect = upload_error
+    def test_upload_bytes_wraps_bytes(self, file_store):
+        """Test that upload_bytes accepts raw bytes."""
+        file_store.client.files.get_metadata.side_effect = NotFound("Not found")
 
-            # Call upload_file
-            with pytest.raises(VolumeUploadError) as exc_info:
-                file_store.upload_file(tmp_file_path, destination_filename="test.txt")
+        assert file_store.upload_bytes(b"test content", destination_filename="raw.txt") is True
 
-            assert exc_info.value.file_path == tmp_file_path
-            assert "test.txt" in exc_info.value.volume_path
-            assert exc_info.value.original_error is upload_error
-            assert "Network timeout" in str(exc_info.value)
+        args = file_store.client.files.upload.call_args
+        assert args[0][0] == "/Volumes/test_catalog/test_schema/test_volume/raw.txt"
+        assert args[0][1].read() == b"test content"
 
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
+    def test_upload_bytes_overwrite_skips_exists_check(self, file_store):
+        """Test that upload_bytes does not query the volume when overwrite=True."""
+        assert file_store.upload_bytes(b"test content", destination_filename="raw.txt", overwrite=True) is True
+        file_store.client.files.get_metadata.assert_not_called()
+
+    def test_upload_bytes_raises_file_already_exists_error(self, file_store):
+        """Test that upload_bytes refuses to replace an existing file without overwrite."""
+        file_store.client.files.get_metadata.return_value = SimpleNamespace()
+
+        with pytest.raises(FileAlreadyExistsError) as exc_info:
+            file_store.upload_bytes(b"test content", destination_filename="existing.txt")
+
+        assert exc_info.value.filename == "existing.txt"
+        file_store.client.files.upload.assert_not_called()
+
+    def test_upload_bytes_raises_volume_upload_error(self, file_store):
+        """Test that upload_bytes wraps Files API failures in VolumeUploadError."""
+        file_store.client.files.get_metadata.side_effect = NotFound("Not found")
+        upload_error = Exception("Network timeout")
+        file_store.client.files.upload.side_effect = upload_error
+
+        with pytest.raises(VolumeUploadError) as exc_info:
+            file_store.upload_bytes(b"test content", destination_filename="test.txt")
+
+        assert exc_info.value.file_path == "test.txt"
+        assert exc_info.value.volume_path == "/Volumes/test_catalog/test_schema/test_volume/test.txt"
+        assert exc_info.value.original_error is upload_error
 
     def test_download_file_success(self, file_store):
         """Test download_file successful download."""
-        mock_response = MagicMock()
-        mock_response.contents.read.return_value = b"file content"
+        mock_response = SimpleNamespace(contents=io.BytesIO(b"file content"))
         file_store.client.files.download.return_value = mock_response
 
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            download_path = tmp_file.name
+        # Capture the local write instead of round-tripping through the filesystem
+        with patch("backend.databricks.volume.open", mock_open(), create=True) as mock_file:
+            result = file_store.download_file("test.txt", "/fake/download.txt")
+
+        assert result is True
+        file_store.client.files.download.assert_called_once_with("/Volumes/test_catalog/test_schema/test_volume/test.txt")
 
-        try:
-            result = file_store.download_file("test.txt", download_path)
-            assert result is True
-            file_store.client.files.download.assert_called_once_with("/Volumes/test_catalog/test_schema/test_volume/test.txt")
+        # Verify file was written
+        mock_file.assert_called_once_with("/fake/download.txt", "wb")
+        assert mock_file().write.call_args_list == [call(b"file content")]
 
-            # Verify file was written
-            with open(download_path, "rb") as f:
-                content = f.read()
-            assert content == b"file content"
+    def test_download_bytes_returns_contents(self, file_store):
+        """Test download_bytes returns the file contents without writing locally."""
+        mock_response = SimpleNamespace(contents=io.BytesIO(b"file content"))
+        file_store.client.files.download.return_value = mock_response
+
+        with patch("backend.databricks.volume.open", mock_open(), create=True) as mock_file:
+            result = file_store.download_bytes("test.txt")
 
-        finally:
-            os.unlink(download_path)
+        assert result == b"file content"
+        file_store.client.files.download.assert_called_once_with("/Volumes/test_catalog/test_schema/test_volume/test.txt")
+        mock_file.assert_not_called()
 
 
 class TestHelperFunctions:
     """Test the helper functions."""
 
-    def test_create_volume_from_config(self):
-        """Test create_volume_from_config uses config defaults."""
+    @pytest.fixture(autouse=True)
+    def _cfg(self):
+        """Install the Databricks volume defaults the helper functions read."""
         set_config_for_test(
-            databricks_catalog="default_catalog",
-            databricks_schema="default_schema",
-            databricks_volume="default_volume",
+            databricks_catalog="config_catalog",
+            databricks_schema="config_schema",
+            databricks_volume="config_volume"
         )
+        yield
+        reset_config_for_test()
 
+    def test_create_volume_from_config(self):
+        """Test create_volume_from_config uses config defaults."""
         volume = create_volume_from_config()
-        assert volume.catalog == "default_catalog"
-        assert volume.schema_name == "default_schema"
-        assert volume.volume_name == "default_volume"
+        assert volume.catalog == "config_catalog"
+        assert volume.schema_name == "config_schema"
+        assert volume.volume_name == "config_volume"
 
     def test_create_volume_from_config_with_overrides(self):
         """Test create_volume_from_config with parameter overrides."""
-        set_config_for_test(
-            databricks_catalog="config_catalog",
-            databricks_schema="config_schema",
-            databricks_volume="config_volume"
-        )
-
         volume = create_volume_from_config(catalog="override_catalog", schema="override_schema")
         assert volume.catalog == "override_catalog"
         assert volume.schema_name == "override_schema"
@@ -288,13 +371,7 @@ class TestHelperFunctions:
 
     def test_create_volume_file_store_from_config(self):
         """Test create_volume_file_store_from_config with mock client."""
-        set_config_for_test(
-            databricks_catalog="config_catalog",
-            databricks_schema="config_schema",
-            databricks_volume="config_volume"
-        )
-
-        mock_client = MagicMock()
+        mock_client = StubClient()
         file_store = create_volume_file_store_from_config(client=mock_client)
 
         assert file_store.volume.catalog == "config_catalog"
@@ -5,16 +5,20 @@ This shows how to use the refactored classes for better
 object-oriented design and explicit dependency injection.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
 # Add the parent directory to sys.path to import backend modules
 sys.path.append(str(Path(__file__).parent.parent))
 
-from backend.routers.volume import Volume, VolumeFileStore, create_volume_from_config, create_volume_file_store_from_config
-from backend.databricks.auth import get_databricks_auth
+from backend.databricks.volume import Volume, VolumeFileStore, create_volume_from_config, create_volume_file_store_from_config
 from unittest.mock import MagicMock
 
+# One stand-in workspace client shared by both examples
+# In real usage, you would use: client = get_databricks_auth().get_workspace_client()
+_DEMO_CLIENT = MagicMock()
+
 
 def example_using_classes():
     """Example using the Volume and VolumeFileStore classes directly."""
@@ -31,9 +35,7 @@ def example_using_classes():
     print(f"File path for 'data.csv': {volume.get_file_path('data.csv')}")
 
     # Create a VolumeFileStore with explicit dependencies
-    # In real usage, you would use: client = get_databricks_auth().get_workspace_client()
-    mock_client = MagicMock()  # Using mock for demonstration
-    file_store = VolumeFileStore(volume, mock_client)
+    file_store = VolumeFileStore(volume, _DEMO_CLIENT)
 
     # Use the file store for operations
     print(f"Volume exists: {file_store.volume_exists()}")
@@ -43,36 +45,53 @@ def example_using_classes():
 def example_using_helper_functions():
     """Example using helper functions for config-based creation."""
 
-    # Set up test config first
-    from backend.config import set_config_for_test
+    # Set up test config first, restoring the real config afterwards
+    from backend.config import reset_config_for_test, set_config_for_test
     set_config_for_test(
         databricks_catalog="config_catalog",
         databricks_schema="config_schema",
         databricks_volume="config_volume"
     )
 
-    # Create Volume from config (with optional overrides)
-    volume = create_volume_from_config(
-        catalog="override_catalog"  # Override catalog, use config for schema/volume
-    )
+    try:
+        # Create Volume from config (with optional overrides)
+        volume = create_volume_from_config(
+            catalog="override_catalog"  # Override catalog, use config for schema/volume
+        )
 
-    # Create VolumeFileStore from config (with explicit mock client)
-    mock_client = MagicMock()
-    file_store = create_volume_file_store_from_config(
-        catalog="my_catalog",
-        schema="my_schema",
-        volume_name="my_volume",
-        client=mock_client
-    )
+        # Create VolumeFileStore from config (with explicit mock client)
+        file_store = create_volume_file_store_from_config(
+            catalog="my_catalog",
+            schema="my_schema",
+            volume_name="my_volume",
+            client=_DEMO_CLIENT
+        )
 
-    print(f"Config-based volume: {file_store.volume.get_full_name()}")
+        print(f"Config-based volume: {file_store.volume.get_full_name()}")
+    finally:
+        reset_config_for_test()
 
 
-if __name__ == "__main__":
-    print("=== Example: Using Volume and VolumeFileStore classes ===")
-    example_using_classes()
+_DEMOS = {
+    "classes": ("Using Volume and VolumeFileStore classes", example_using_classes),
+    "helpers": ("Using helper functions", example_using_helper_functions),
+}
 
-    print("\n=== Example: Using helper functions ===")
-    example_using_helper_functions()
 
-    print("\nAll examples completed successfully!")
\ No newline at end of file
+def main(argv=None):
+    """Run the selected demo, or all of them."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("demo", nargs="?", choices=[*_DEMOS, "all"], default="all", help="Demo to run (default: all)")
+    args = parser.parse_args(argv)
+
+    selected = _DEMOS if args.demo == "all" else {args.demo: _DEMOS[args.demo]}
+    for title, demo in selected.values():
+        print(f"=== Example: {title} ===")
+        demo()
+        print()
+
+    print("All examples completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,66 +6,193 @@ to Databricks volumes using the Volume and VolumeFileStore classes from the back
 """
 
 import streamlit as st
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import sys
 from pathlib import Path
 import cv2
 import numpy as np
-from io import BytesIO
-from PIL import Image
-import fitz  # PyMuPDF
 
-# Add the parent directory to sys.path to import backend modules
-sys.path.append(str(Path(__file__).parent.parent))
+# Add the parent directory to sys.path to import backend modules. Streamlit re-executes
+# this script on every rerun, so only add it once
+_REPO_ROOT = str(Path(__file__).parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
 
 from backend.databricks.volume import create_volume_file_store_from_config
 from backend.logging import get_logger
-from backend.exceptions import FileAlreadyExistsError, FileNotFoundError, VolumeUploadError
+from backend.exceptions import FileAlreadyExistsError, VolumeUploadError
+from backend.documents.document import FragmentSoA
 from backend.documents.factory import DocumentFactory
 from backend.config import get_config
 
 logger = get_logger(__name__)
 
-def draw_tile_boundaries(image: np.ndarray, fragments: list) -> np.ndarray:
-    """Draw tile boundaries on an image.
+# Concurrent volume uploads; each one is a blocking Databricks REST call
+UPLOAD_WORKERS = 8
+
+# Upper bound on progress bar updates sent during one upload batch
+PROGRESS_UPDATES = 50
+
+# Concurrent file previews; decode/render work is in OpenCV and PyMuPDF
+PREVIEW_WORKERS = 8
+
+@st.cache_resource(show_spinner=False)
+def _pdf_preview_lock() -> threading.Lock:
+    """Lock serializing PDF previews across reruns and sessions.
+
+    PyMuPDF is not thread-safe, so PDF previews render one at a time while
+    image previews run alongside them. Streamlit re-executes this script on every
+    rerun, so the lock is cached as a resource rather than built at module level.
+    """
+    return threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _prefetch_executor() -> ThreadPoolExecutor:
+    """Background threads for prefetching volume listings while the page renders.
+
+    Cached as a resource so reruns share one pool instead of each leaving idle
+    threads behind.
+    """
+    return ThreadPoolExecutor(max_workers=2)
+
+@st.cache_resource(show_spinner=False)
+def _document_factory() -> DocumentFactory:
+    """DocumentFactory is stateless (config is read per call), so one instance serves every preview."""
+    return DocumentFactory()
+
+# Longest side of the images sent to the browser; the preview columns are far
+# narrower than a full-resolution page render
+PREVIEW_MAX_DIM = 1024
+
+def _thumb(image: np.ndarray, max_dim: int = PREVIEW_MAX_DIM) -> tuple[np.ndarray, float]:
+    """Downscale an image so its longest side is at most max_dim.
+    
+    Returns:
+        The (possibly unchanged) image and the scale factor applied to it
+    """
+    height, width = image.shape[:2]
+    scale = max_dim / max(height, width)
+    if scale >= 1:
+        return image, 1.0
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), scale
+
+# JPEG quality for the preview images sent to the browser
+PREVIEW_JPEG_QUALITY = 85
+
+def _display_jpeg(image: np.ndarray) -> bytes:
+    """Encode a BGR image as JPEG for st.image.
+
+    OpenCV encodes BGR as-is, so this skips the channel flip, the range checks and
+    the Pillow encode that st.image would otherwise run on an ndarray.
+    """
+    return cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, PREVIEW_JPEG_QUALITY])[1].tobytes()
+
+# Visually distinct tile colors, cycled through per fragment (BGR for OpenCV)
+_TILE_COLORS_BGR = np.array(
+    [
+        (int(h[4:6], 16), int(h[2:4], 16), int(h[0:2], 16))
+        for h in (
+            'e6194B', '3cb44b', 'ffe119', '4363d8', 'f58231', '42d4f4',
+            'f032e6', 'fabed4', '469990', 'dcbeff', '9A6324', 'fffac8',
+            '800000', 'aaffc3', '000075', 'a9a9a9',
+        )
+    ],
+    dtype=np.uint8,
+)
+
+# Border thickness in pixels for drawn tile boundaries
+_TILE_BORDER = 2
+
+def _ragged_ranges(starts: np.ndarray, stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenate range(start, stop) for each pair without a Python loop.
+    
+    Returns:
+        (owner, values): the index of the pair each value came from, and the values
+    """
+    lengths = np.maximum(stops - starts, 0)
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, starts[owner] + offsets
+
+def _fragment_bboxes(fragments) -> np.ndarray:
+    """Gather fragment bounding boxes into an (N, 4) array of x1, y1, x2, y2."""
+    if isinstance(fragments, FragmentSoA):
+        return fragments.bboxes
+    if isinstance(fragments, np.ndarray):
+        return fragments.reshape(-1, 4)
+    return np.array([f.bbox for f in fragments], dtype=np.int32).reshape(-1, 4)
+
+def paint_tile_boundaries(image: np.ndarray, fragments, scale: float = 1.0) -> None:
+    """Draw tile boundaries onto an image in place.
+    
+    All border pixels are computed as index arrays and painted in a single write
+    rather than one cv2.rectangle call per fragment.
     
     Args:
-        image: The input image (BGR format)
-        fragments: List of PageFragment objects with bbox attributes
-        
+        image: The image to draw on (BGR format); it is modified
+        fragments: An (N, 4) array of x1, y1, x2, y2 bounding boxes, a FragmentSoA, or a
+            list of PageFragment objects with bbox attributes
+        scale: Factor the image was resized by relative to the fragment coordinates
+    """
+    bboxes = _fragment_bboxes(fragments)
+    if not len(bboxes):
+        return
+    
+    height, width = image.shape[:2]
+    bboxes = np.rint(bboxes * scale).astype(np.intp)
+    x1 = np.clip(bboxes[:, 0], 0, width)
+    y1 = np.clip(bboxes[:, 1], 0, height)
+    x2 = np.clip(bboxes[:, 2], 0, width)
+    y2 = np.clip(bboxes[:, 3], 0, height)
+    
+    # Drop boxes with no area left after clipping; their side edges would otherwise
+    # still paint a stray line
+    keep = np.flatnonzero((x2 > x1) & (y2 > y1))
+    x1, y1, x2, y2 = x1[keep], y1[keep], x2[keep], y2[keep]
+    
+    ys, xs, owners = [], [], []
+    for offset in range(_TILE_BORDER):
+        # Top and bottom edges: one row per fragment, spanning its width
+        owner, cols = _ragged_ranges(x1, x2)
+        for rows in (y1 + offset, y2 - 1 - offset):
+            ys.append(rows[owner])
+            xs.append(cols)
+            owners.append(owner)
+        # Left and right edges: one column per fragment, spanning its height
+        owner, rows = _ragged_ranges(y1, y2)
+        for cols in (x1 + offset, x2 - 1 - offset):
+            ys.append(rows)
+            xs.append(cols[owner])
+            owners.append(owner)
+    
+    ys = np.clip(np.concatenate(ys), 0, height - 1)
+    xs = np.clip(np.concatenate(xs), 0, width - 1)
+    # Map back to fragment indices so colors stay tied to the fragment's position
+    owners = keep[np.concatenate(owners)]
+    
+    # Match the palette to the image's channel layout
+    palette = _TILE_COLORS_BGR
+    if image.ndim == 2:
+        palette = palette[:, 0]
+    elif image.shape[2] == 4:
+        palette = np.hstack([palette, np.full((len(palette), 1), 255, dtype=np.uint8)])
+    
+    # Cycle through colors if there are more fragments than colors
+    image[ys, xs] = palette[owners % len(palette)]
+
+def draw_tile_boundaries(image: np.ndarray, fragments, scale: float = 1.0) -> np.ndarray:
+    """Draw tile boundaries on a copy of an image, leaving the original untouched.
+    
+    Takes the same arguments as paint_tile_boundaries.
+    
     Returns:
         Image with distinct colored rectangle boundaries drawn
     """
-    # Make a copy to avoid modifying the original
     image_with_boundaries = image.copy()
-    
-    # Predefined visually distinct colors (hex format)
-    distinct_hex_colors = [
-        '#e6194B', '#3cb44b', '#ffe119', '#4363d8', '#f58231', '#42d4f4', 
-        '#f032e6', '#fabed4', '#469990', '#dcbeff', '#9A6324', '#fffac8', 
-        '#800000', '#aaffc3', '#000075', '#a9a9a9'
-    ]
-    
-    def hex_to_bgr(hex_color):
-        """Convert hex color to BGR format for OpenCV."""
-        hex_color = hex_color.lstrip('#')
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return (b, g, r)  # BGR format for OpenCV
-    
-    # Convert hex colors to BGR format
-    bgr_colors = [hex_to_bgr(color) for color in distinct_hex_colors]
-    
-    # Draw rectangles for each fragment with distinct colors
-    for i, fragment in enumerate(fragments):
-        x1, y1, x2, y2 = fragment.bbox
-        # Cycle through colors if there are more fragments than colors
-        color = bgr_colors[i % len(bgr_colors)]
-        # Draw rectangle border with unique color for each fragment (thickness 2)
-        cv2.rectangle(image_with_boundaries, (x1, y1), (x2, y2), color, 2)
-    
+    paint_tile_boundaries(image_with_boundaries, fragments, scale)
     return image_with_boundaries
 
 st.set_page_config(
@@ -75,132 +202,175 @@ st.set_page_config(
 )
 
 def get_preview_data_for_image(file_bytes: bytes, filename: str) -> list[dict]:
-    """Get preview data for a single image file using native loaders and Document processing."""
-    # Load original image using PIL (native frontend loader)
+    """Get preview data for a single image file using Document processing."""
+    # Create Document using DocumentFactory to get processed content. The factory's
+    # decode of the upload doubles as the "original", so the file is decoded once
+    # and no second full-size copy of the image is held
     try:
-        original_pil = Image.open(BytesIO(file_bytes))
-        original_array = np.array(original_pil)
-        # Convert RGB to BGR for OpenCV compatibility in display
-        if len(original_array.shape) == 3 and original_array.shape[2] == 3:
-            original_image = cv2.cvtColor(original_array, cv2.COLOR_RGB2BGR)
-        else:
-            original_image = original_array
-    except Exception as e:
-        raise ValueError(f"Failed to load original image {filename}: {e}")
-    
-    # Create Document using DocumentFactory to get processed content
-    try:
-        with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as tmp_file:
-            tmp_file.write(file_bytes)
-            tmp_file_path = tmp_file.name
-            
-        try:
-            factory = DocumentFactory()
-            document = factory.from_disk(Path(tmp_file_path))
-            
-            # Extract processed image from Document.pages[0].content
-            page_content = document.pages[0].content
-            processed_array = np.frombuffer(page_content, np.uint8)
-            processed_image = cv2.imdecode(processed_array, cv2.IMREAD_COLOR)
-            
-            if processed_image is None:
-                raise ValueError("Failed to decode processed image from Document")
-            
-            # Fragment the page to get tile boundaries
-            fragments = document.pages[0].fragment(complexity_threshold=0.0)
-            
-            # Check if resizing occurred by comparing dimensions
-            was_resized = (original_image.shape[:2] != processed_image.shape[:2])
-            
-            return [{
-                'page_number': 1,
-                'original_image': original_image,
-                'processed_image': processed_image,
-                'was_resized': was_resized,
-                'fragments': fragments
-            }]
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+        document = _document_factory().from_bytes(file_bytes, filename, keep_source_images=True)
+        original_image = document.pages[0].source_image
+        
+        # The factory hands back the processed image it encoded, so there is nothing to decode
+        processed_image = document.pages[0].image_array
+        
+        if processed_image is None:
+            raise ValueError("Failed to decode processed image from Document")
+        
+        # Fragment the page to get tile boundaries; only the (N, 4) bounding boxes are drawn
+        fragments = document.pages[0].fragment_soa(complexity_threshold=0.0).bboxes
+        
+        # Check if resizing occurred by comparing dimensions
+        was_resized = (original_image.shape[:2] != processed_image.shape[:2])
+        
+        return [{
+            'page_number': 1,
+            'original_image': original_image,
+            'original_size': document.pages[0].source_size,
+            'processed_image': processed_image,
+            'was_resized': was_resized,
+            'fragments': fragments
+        }]
                 
     except Exception as e:
         raise RuntimeError(f"Failed to create Document for {filename}: {e}")
 
 def get_preview_data_for_pdf(file_bytes: bytes, filename: str) -> list[dict]:
-    """Get preview data for a PDF file using native loaders and Document processing."""
-    app_config = get_config()
+    """Get preview data for a PDF file using Document processing."""
     preview_data = []
     
     try:
-        # Create temporary file for processing
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(file_bytes)
-            tmp_file_path = tmp_file.name
+        # Create Document using DocumentFactory, keeping a display-sized render of each
+        # page as the "original"; a full-resolution render of every page of a large
+        # PDF can run to gigabytes, and only its size is shown
+        document = _document_factory().from_bytes(
+            file_bytes, filename, keep_source_images=True, source_max_dim=PREVIEW_MAX_DIM
+        )
+        
+        # Process each page
+        for i, document_page in enumerate(document.pages):
+            original_image = document_page.source_image
             
-        try:
-            # Load original PDF using PyMuPDF (native frontend loader)
-            original_doc = fitz.open(tmp_file_path)
+            processed_image = document_page.image_array
             
-            # Create Document using DocumentFactory to get processed content
-            factory = DocumentFactory()
-            document = factory.from_disk(Path(tmp_file_path))
+            if processed_image is None:
+                raise ValueError(f"Failed to decode processed page {i+1} from Document")
             
-            # Process each page
-            for i, (original_page, document_page) in enumerate(zip(original_doc, document.pages)):
-                # Get original page as image using native loader
-                pix = original_page.get_pixmap(dpi=app_config.image_dpi)
-                original_array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
-                if original_array.shape[2] == 4:
-                    original_array = cv2.cvtColor(original_array, cv2.COLOR_RGBA2RGB)
-                # Convert RGB to BGR for OpenCV compatibility
-                original_image = cv2.cvtColor(original_array, cv2.COLOR_RGB2BGR)
-                
-                # Extract processed image from Document.pages[i].content
-                page_content = document_page.content
-                processed_array = np.frombuffer(page_content, np.uint8)
-                processed_image = cv2.imdecode(processed_array, cv2.IMREAD_COLOR)
-                
-                if processed_image is None:
-                    raise ValueError(f"Failed to decode processed page {i+1} from Document")
-                
-                # Fragment the page to get tile boundaries
-                fragments = document_page.fragment(complexity_threshold=0.0)
-                
-                # Check if resizing occurred by comparing dimensions
-                was_resized = (original_image.shape[:2] != processed_image.shape[:2])
-                
-                preview_data.append({
-                    'page_number': i + 1,
-                    'original_image': original_image,
-                    'processed_image': processed_image,
-                    'was_resized': was_resized,
-                    'fragments': fragments
-                })
+            # Fragment the page to get tile boundaries; only the (N, 4) bounding boxes are drawn
+            fragments = document_page.fragment_soa(complexity_threshold=0.0).bboxes
             
-            return preview_data
+            # Check if resizing occurred by comparing full-resolution dimensions
+            was_resized = (document_page.source_size != processed_image.shape[1::-1])
             
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+            preview_data.append({
+                'page_number': i + 1,
+                'original_image': original_image,
+                'original_size': document_page.source_size,
+                'processed_image': processed_image,
+                'was_resized': was_resized,
+                'fragments': fragments
+            })
+        
+        return preview_data
             
     except Exception as e:
         raise RuntimeError(f"Failed to preview PDF {filename}: {e}")
 
-def get_preview_data(uploaded_file) -> list[dict]:
-    """Get preview data for any supported file type."""
+def _preview_thumbnails(page_data: dict) -> dict:
+    """Swap a page's full-resolution images for display-sized thumbnails.
+
+    st.cache_data pickles what it stores and unpickles a fresh copy on every hit,
+    so caching only the thumbnails keeps each rerun from copying full-size renders.
+    Sizes are (width, height) of the full-resolution images, for the captions.
+    """
+    original, processed = page_data['original_image'], page_data['processed_image']
+    processed_thumb, processed_scale = _thumb(processed)
+    return {
+        'page_number': page_data['page_number'],
+        'original_thumb': _thumb(original)[0] if page_data['was_resized'] else processed_thumb,
+        'processed_thumb': processed_thumb,
+        'processed_scale': processed_scale,
+        'original_size': page_data['original_size'],
+        'processed_size': processed.shape[1::-1],
+        'was_resized': page_data['was_resized'],
+        'fragments': page_data['fragments'],
+    }
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_preview_data(file_id: str, filename: str, _file_bytes: bytes) -> list[dict]:
+    """Build preview data for an uploaded file, cached across reruns.
+
+    Widget reruns (e.g. toggling tile boundaries) reuse the display thumbnails
+    instead of reprocessing the file. The cache is keyed on Streamlit's per-upload file_id
+    rather than a hash of the file bytes, which would be a full pass over every
+    upload on every rerun.
+    """
     app_config = get_config()
-    file_extension = Path(uploaded_file.name).suffix.lower()
-    file_bytes = uploaded_file.getvalue()
+    file_extension = Path(filename).suffix.lower()
     
     if file_extension in app_config.allowed_image_extensions:
-        return get_preview_data_for_image(file_bytes, uploaded_file.name)
+        pages = get_preview_data_for_image(_file_bytes, filename)
     elif file_extension in app_config.allowed_pdf_extensions:
-        return get_preview_data_for_pdf(file_bytes, uploaded_file.name)
+        with _pdf_preview_lock():
+            pages = get_preview_data_for_pdf(_file_bytes, filename)
     else:
         raise ValueError(f"Unsupported file type: {file_extension}")
+    return [_preview_thumbnails(page_data) for page_data in pages]
+
+def get_preview_data(uploaded_file) -> list[dict]:
+    """Get preview data for any supported file type."""
+    return _cached_preview_data(uploaded_file.file_id, uploaded_file.name, uploaded_file.getvalue())
+
+@st.cache_resource(show_spinner=False)
+def _get_file_store():
+    """Build the volume file store once and share it across reruns.
+
+    Failures are not cached, so a misconfigured app retries on the next rerun.
+    """
+    return create_volume_file_store_from_config()
+
+@st.cache_resource(show_spinner=False)
+def _listing_state() -> dict:
+    """Generation counter for volume listings, bumped whenever they are invalidated."""
+    return {'generation': 0}
+
+def _invalidate_volume_listing():
+    """Drop cached volume listings, including any a background prefetch is still fetching.
+
+    The bumped generation both misses the cache and marks in-flight prefetches as stale,
+    so a listing started before an upload or refresh is never shown after it.
+    """
+    _listing_state()['generation'] += 1
+    _list_volume_files.clear()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_volume_files(volume_path: str, generation: int, _file_store) -> list[str]:
+    """List the files in a volume, cached briefly so widget reruns skip the API call.
+
+    volume_path and the listing generation key the cache; the store itself is
+    excluded from hashing.
+    """
+    return _file_store.list_files()
+
+def _fetch_volume_listing(file_store) -> tuple[int, list[str]]:
+    """List the volume's files, returning them with the generation they were fetched for."""
+    generation = _listing_state()['generation']
+    return generation, _list_volume_files(file_store.volume.get_volume_path(), generation, file_store)
+
+def _dedupe_uploads(uploaded_files) -> list:
+    """Drop repeat uploads of the same file, e.g. one dragged in twice.
+
+    Only uploads that share a name and size are compared, byte for byte, so
+    distinct files are never read just to be told apart.
+    """
+    unique = []
+    seen = {}
+    for uploaded_file in uploaded_files:
+        twins = seen.setdefault((uploaded_file.name, uploaded_file.size), [])
+        if any(twin.getvalue() == uploaded_file.getvalue() for twin in twins):
+            continue
+        twins.append(uploaded_file)
+        unique.append(uploaded_file)
+    return unique
 
 def main():
     """Main Streamlit application."""
@@ -210,9 +380,13 @@ def main():
     # Sidebar for configuration
     st.sidebar.header("Configuration")
     
+    if st.sidebar.button("🔄 Reconnect", help="Rebuild the Databricks connection and refresh the volume listing"):
+        _get_file_store.clear()
+        _invalidate_volume_listing()
+    
     # Get current configuration status
     try:
-        file_store = create_volume_file_store_from_config()
+        file_store = _get_file_store()
         config_status = "✅ Connected"
         config_details = f"Catalog: {file_store.volume.catalog}\nSchema: {file_store.volume.schema_name}\nVolume: {file_store.volume.volume_name}"
     except Exception as e:
@@ -237,13 +411,15 @@ def main():
         """)
         return
     
-    # Show volume contents on page load
-    show_volume_contents(file_store)
+    # Start listing the volume now so the request overlaps with building the rest
+    # of the page; the listing is rendered into this placeholder at the end
+    files_future = _prefetch_executor().submit(_fetch_volume_listing, file_store)
+    volume_contents = st.container()
     
     # Main upload interface
     st.header("File Upload")
     
-    # Overwrite checkbox
+    # Overwrite checkbox; when checked, uploads skip the existence lookup entirely
     overwrite = st.checkbox(
         "Overwrite existing files",
         value=False,
@@ -258,6 +434,8 @@ def main():
     )
     
     if uploaded_files:
+        # A file added twice would otherwise be previewed twice and race itself to the volume
+        uploaded_files = _dedupe_uploads(uploaded_files)
         st.subheader("File Preview")
         
         # Create tabs for preview and upload
@@ -266,17 +444,20 @@ def main():
         with preview_tab:
             st.markdown("**Preview how your files will be processed before uploading:**")
             
-            # Process each file for preview
+            # Process files for preview concurrently; decoding and rendering happen in
+            # GIL-releasing C extensions. Results are collected in upload order and
+            # all Streamlit calls stay on this thread.
             preview_data = {}
-            for uploaded_file in uploaded_files:
-                try:
-                    # Get preview data directly from uploaded file
-                    file_preview = get_preview_data(uploaded_file)
-                    preview_data[uploaded_file.name] = file_preview
-                        
-                except Exception as e:
-                    st.error(f"❌ Failed to preview {uploaded_file.name}: {str(e)}")
-                    continue
+            with ThreadPoolExecutor(max_workers=min(PREVIEW_WORKERS, len(uploaded_files))) as executor:
+                futures = [
+                    (uploaded_file.name, executor.submit(get_preview_data, uploaded_file))
+                    for uploaded_file in uploaded_files
+                ]
+                for filename, future in futures:
+                    try:
+                        preview_data[filename] = future.result()
+                    except Exception as e:
+                        st.error(f"❌ Failed to preview {filename}: {str(e)}")
             
             # Display preview for each file
             for filename, pages in preview_data.items():
@@ -289,22 +470,27 @@ def main():
             
             # Display file information
             for file in uploaded_files:
-                with st.expander(f"📄 {file.name} ({file.size:,} bytes)"):
-                    st.write(f"**Name:** {file.name}")
-                    st.write(f"**Size:** {file.size:,} bytes")
-                    st.write(f"**Type:** {file.type}")
+                name, size, file_type = file.name, file.size, file.type
+                with st.expander(f"📄 {name} ({size:,} bytes)"):
+                    st.write(f"**Name:** {name}")
+                    st.write(f"**Size:** {size:,} bytes")
+                    st.write(f"**Type:** {file_type}")
             
             # Upload button
             if st.button("🚀 Upload Files", type="primary"):
-                upload_files(uploaded_files, file_store, overwrite)
+                if upload_files(uploaded_files, file_store, overwrite):
+                    # The prefetched listing predates the upload
+                    files_future = None
+    
+    # Show volume contents on page load
+    with volume_contents:
+        show_volume_contents(file_store, files_future)
 
 def show_image_comparison(page_data, filename, total_pages):
     """Display side-by-side comparison of original vs processed image."""
     page_num = page_data['page_number']
-    original = page_data['original_image']
-    processed = page_data['processed_image']
     was_resized = page_data['was_resized']
-    fragments = page_data.get('fragments', [])
+    fragments = page_data.get('fragments', ())
     
     if total_pages > 1:  # Multi-page document
         st.markdown(f"**Page {page_num}:**")
@@ -317,6 +503,17 @@ def show_image_comparison(page_data, filename, total_pages):
         help="Display red rectangles showing how the image will be divided into tiles for processing"
     )
     
+    # Get processed image to display, drawing boundaries on the thumbnail. Each cache
+    # hit hands back a fresh copy of the preview, so it can be drawn on directly
+    display_image = page_data['processed_thumb']
+    if show_boundaries and len(fragments):
+        paint_tile_boundaries(display_image, fragments, page_data['processed_scale'])
+    
+    width, height = page_data['processed_size']
+    caption = f"Size: {width}×{height}"
+    if show_boundaries and len(fragments):
+        caption += f" | {len(fragments)} tiles"
+    
     if was_resized:
         st.info(f"🔄 This {'page' if total_pages > 1 else 'image'} will be resized during processing.")
         
@@ -325,101 +522,105 @@ def show_image_comparison(page_data, filename, total_pages):
         
         with col1:
             st.markdown("**Original:**")
-            # Convert from BGR to RGB for display
-            original_rgb = cv2.cvtColor(original, cv2.COLOR_BGR2RGB)
-            st.image(original_rgb, use_container_width=True)
-            st.caption(f"Size: {original.shape[1]}×{original.shape[0]}")
+            st.image(_display_jpeg(page_data['original_thumb']), output_format="JPEG", use_container_width=True)
+            width, height = page_data['original_size']
+            st.caption(f"Size: {width}×{height}")
         
         with col2:
             st.markdown("**After Processing:**")
-            # Get processed image to display
-            display_image = processed
-            if show_boundaries and fragments:
-                display_image = draw_tile_boundaries(processed, fragments)
-            
-            # Convert from BGR to RGB for display
-            processed_rgb = cv2.cvtColor(display_image, cv2.COLOR_BGR2RGB)
-            st.image(processed_rgb, use_container_width=True)
-            caption = f"Size: {processed.shape[1]}×{processed.shape[0]}"
-            if show_boundaries and fragments:
-                caption += f" | {len(fragments)} tiles"
+            st.image(_display_jpeg(display_image), output_format="JPEG", use_container_width=True)
             st.caption(caption)
     else:
         st.success(f"✅ This {'page' if total_pages > 1 else 'image'} is within size limits and will not be resized.")
         
-        # Show the original image (which is same as processed)
-        display_image = original
-        if show_boundaries and fragments:
-            display_image = draw_tile_boundaries(original, fragments)
-            
-        display_rgb = cv2.cvtColor(display_image, cv2.COLOR_BGR2RGB)
-        st.image(display_rgb, use_container_width=True)
-        caption = f"Size: {original.shape[1]}×{original.shape[0]}"
-        if show_boundaries and fragments:
-            caption += f" | {len(fragments)} tiles"
+        # Show the processed image (which is same as original)
+        st.image(_display_jpeg(display_image), output_format="JPEG", use_container_width=True)
         st.caption(caption)
 
-def upload_files(uploaded_files, file_store, overwrite):
-    """Upload files to Databricks volume."""
+def _upload_one(file_store, uploaded_file, overwrite, existing_names) -> bool:
+    """Stream a single uploaded file straight to the volume.
+
+    Streamlit hands back the same UploadedFile on every rerun, so rewind it first;
+    otherwise a repeat upload would read from wherever the last one stopped.
+    """
+    uploaded_file.seek(0)
+    assume_exists = None if existing_names is None else uploaded_file.name in existing_names
+    return file_store.upload_bytes(
+        uploaded_file,
+        destination_filename=uploaded_file.name,
+        overwrite=overwrite,
+        assume_exists=assume_exists,
+    )
+
+def upload_files(uploaded_files, file_store, overwrite) -> int:
+    """Upload files to Databricks volume.
+
+    Uploads are network-bound, so they run concurrently on a small thread pool;
+    Streamlit widgets are only updated from this thread as uploads complete.
+
+    Returns:
+        Number of files uploaded successfully
+    """
     progress_bar = st.progress(0)
     status_text = st.empty()
     
     total_files = len(uploaded_files)
+    progress_tick = max(1, -(-total_files // PROGRESS_UPDATES))  # Ceiling division
     successful_uploads = 0
     failed_uploads = []
+    completed = 0
     
-    for i, uploaded_file in enumerate(uploaded_files):
-        status_text.text(f"Uploading {uploaded_file.name}...")
-        progress_bar.progress((i + 1) / total_files)
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{uploaded_file.name}") as tmp_file:
+    # One listing answers every "already exists?" question for the batch instead
+    # of a metadata lookup per file. Overwrites never ask, so skip it for them.
+    # If the listing fails, each upload falls back to its own existence lookup.
+    existing_names = None
+    if not overwrite:
+        try:
+            existing_names = {os.path.basename(path) for path in file_store.list_files_iter()}
+        except Exception as e:
+            logger.error(f"Failed to list volume files before upload: {e}")
+    
+    status_text.text(f"Uploading {total_files} file(s)...")
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(_upload_one, file_store, uploaded_file, overwrite, existing_names): uploaded_file.name
+            for uploaded_file in uploaded_files
+        }
+        for future in as_completed(futures):
+            filename = futures[future]
+            completed += 1
+            # Each update is a websocket message, so large batches only report every tick-th file
+            if completed % progress_tick == 0 or completed == total_files:
+                status_text.text(f"Uploaded {completed} of {total_files}: {filename}")
+                progress_bar.progress(completed / total_files)
+            
             try:
-                # Write uploaded file content to temporary file
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-                
-                # Upload using VolumeFileStore with original filename
-                success = file_store.upload_file(tmp_file_path, overwrite=overwrite, destination_filename=uploaded_file.name)
+                success = future.result()
                 
                 if success:
                     successful_uploads += 1
-                    logger.info(f"Successfully uploaded {uploaded_file.name}")
+                    logger.info(f"Successfully uploaded {filename}")
                     
             except FileAlreadyExistsError as e:
                 failed_uploads.append({
-                    'filename': uploaded_file.name,
+                    'filename': filename,
                     'error': f"File already exists in volume '{e.volume_name}'. Enable 'Overwrite existing files' to replace it."
                 })
-                logger.error(f"File already exists: {uploaded_file.name}")
-                
-            except FileNotFoundError as e:
-                failed_uploads.append({
-                    'filename': uploaded_file.name,
-                    'error': f"Temporary file could not be created or accessed."
-                })
-                logger.error(f"File not found: {e}")
+                logger.error(f"File already exists: {filename}")
                 
             except VolumeUploadError as e:
                 failed_uploads.append({
-                    'filename': uploaded_file.name,
+                    'filename': filename,
                     'error': f"Upload failed: {e.original_error}"
                 })
                 logger.error(f"Upload error: {e}")
                 
             except Exception as e:
                 failed_uploads.append({
-                    'filename': uploaded_file.name,
+                    'filename': filename,
                     'error': f"Unexpected error: {str(e)}"
                 })
-                logger.error(f"Unexpected error uploading {uploaded_file.name}: {e}")
-                
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(tmp_file_path)
-                except Exception as e:
-                    logger.warning(f"Failed to delete temporary file {tmp_file_path}: {e}")
+                logger.error(f"Unexpected error uploading {filename}: {e}")
     
     # Display results
     status_text.empty()
@@ -433,21 +634,42 @@ def upload_files(uploaded_files, file_store, overwrite):
         for failed_upload in failed_uploads:
             st.write(f"**{failed_upload['filename']}**: {failed_upload['error']}")
     
-    # Show volume contents
+    # Drop the cached listing so the volume contents panel picks up the new files
     if successful_uploads > 0:
-        show_volume_contents(file_store)
+        _invalidate_volume_listing()
+    
+    return successful_uploads
+
+@st.fragment
+def show_volume_contents(file_store, files_future=None):
+    """Display current files in the volume.
 
-def show_volume_contents(file_store):
-    """Display current files in the volume."""
+    Runs as a fragment, so refreshing the listing reruns only this panel rather
+    than the whole page and its file previews.
+
+    Args:
+        file_store: VolumeFileStore to list
+        files_future: Optional future already running _fetch_volume_listing in the background
+    """
     st.subheader("📂 Volume Contents")
     
+    if st.button("🔄 Refresh", key="refresh_volume_contents"):
+        _invalidate_volume_listing()
+        files_future = None
+    
     try:
-        files = file_store.list_files()
+        files = None
+        if files_future is not None:
+            generation, files = files_future.result()
+            # Discard a prefetch started before the listing was last invalidated
+            if generation != _listing_state()['generation']:
+                files = None
+        if files is None:
+            files = _fetch_volume_listing(file_store)[1]
         if files:
             st.write(f"Found {len(files)} file(s) in the volume:")
-            for file_path in files:
-                filename = os.path.basename(file_path)
-                st.write(f"- {filename}")
+            # One markdown element for the whole listing rather than one per file
+            st.markdown("\n".join(f"- {file_path.rsplit('/', 1)[-1]}" for file_path in files))
         else:
             st.info("No files found in the volume.")
     except Exception as e:
@@ -3,11 +3,7 @@ Tests for the frontend application.
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-# Add the parent directory to sys.path to import modules
-sys.path.append(str(Path(__file__).parent.parent))
 
 def test_frontend_imports():
     """Test that the frontend module can be imported."""
@@ -32,4 +28,176 @@ def test_frontend_module_structure():
     
     # Check that the package has a docstring
     assert frontend.__doc__ is not None
-    assert "Streamlit" in frontend.__doc__
\ No newline at end of file
+    assert "Streamlit" in frontend.__doc__
+
+def test_upload_one_rewinds_reused_uploaded_file():
+    """Test that uploading the same UploadedFile twice sends its full contents both times."""
+    from io import BytesIO
+    from frontend.app import _upload_one
+
+    class FakeFileStore:
+        def __init__(self):
+            self.uploaded = []
+
+        def upload_bytes(self, contents, destination_filename, overwrite=False, assume_exists=None):
+            self.uploaded.append((destination_filename, contents.read()))
+            return True
+
+    # Streamlit reuses the same file object across reruns, cursor and all
+    uploaded_file = BytesIO(b"test content")
+    uploaded_file.name = "test.txt"
+    file_store = FakeFileStore()
+
+    assert _upload_one(file_store, uploaded_file, False, None) is True
+    assert _upload_one(file_store, uploaded_file, True, None) is True
+
+    assert file_store.uploaded == [("test.txt", b"test content"), ("test.txt", b"test content")]
+
+def test_thumb_limits_longest_side():
+    """Test that preview thumbnails are capped in size and small images pass through."""
+    import numpy as np
+    from frontend.app import _thumb
+
+    large = np.zeros((3000, 2000, 3), dtype=np.uint8)
+    thumb, scale = _thumb(large, max_dim=1024)
+    assert thumb.shape == (1024, 683, 3)
+    assert scale == 1024 / 3000
+
+    small = np.zeros((100, 50, 3), dtype=np.uint8)
+    thumb, scale = _thumb(small, max_dim=1024)
+    assert thumb is small
+    assert scale == 1.0
+
+def test_display_jpeg_keeps_bgr_channel_order():
+    """Test that preview images are encoded straight from BGR without swapping channels."""
+    import cv2
+    import numpy as np
+    from frontend.app import _display_jpeg
+
+    image = np.zeros((40, 60, 3), dtype=np.uint8)
+    image[..., 0] = 255  # Blue in BGR
+    decoded = cv2.imdecode(np.frombuffer(_display_jpeg(image), np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == image.shape
+    assert decoded[20, 30, 0] > 200 and decoded[20, 30, 2] < 50
+
+def test_draw_tile_boundaries_paints_borders_only():
+    """Test that tile borders are painted in cycling colors without touching the interior."""
+    import numpy as np
+    from backend.documents.document import PageFragment
+    from frontend.app import _TILE_COLORS_BGR, draw_tile_boundaries
+
+    image = np.zeros((100, 120, 3), dtype=np.uint8)
+    fragments = [PageFragment(b"", [0, 0, 60, 50]), PageFragment(b"", [60, 50, 120, 100])]
+
+    drawn = draw_tile_boundaries(image, fragments)
+
+    assert not image.any()  # input left untouched
+    assert (drawn[0, 10] == _TILE_COLORS_BGR[0]).all()
+    assert (drawn[25, 58] == _TILE_COLORS_BGR[0]).all()
+    assert (drawn[99, 90] == _TILE_COLORS_BGR[1]).all()
+    assert not drawn[25, 30].any()
+    assert not drawn[75, 90].any()
+
+def test_preview_cache_keyed_on_file_id(monkeypatch):
+    """Test that previews are cached per upload without hashing the file bytes."""
+    from io import BytesIO
+    import frontend.app as app
+
+    calls = []
+    monkeypatch.setattr(app, "get_preview_data_for_image", lambda data, name: calls.append(name) or [])
+    app._cached_preview_data.clear()
+
+    def uploaded(file_id):
+        f = BytesIO(b"not really an image")
+        f.name, f.file_id = "image.jpg", file_id
+        return f
+
+    app.get_preview_data(uploaded("upload-1"))
+    app.get_preview_data(uploaded("upload-1"))
+    app.get_preview_data(uploaded("upload-2"))
+
+    assert calls == ["image.jpg", "image.jpg"]
+    app._cached_preview_data.clear()
+
+def test_preview_thumbnails_drop_full_resolution_images():
+    """Test that cached previews hold display thumbnails and remember the full sizes."""
+    import numpy as np
+    from frontend.app import PREVIEW_MAX_DIM, _preview_thumbnails
+
+    original = np.zeros((4000, 3000, 3), dtype=np.uint8)
+    processed = np.zeros((2048, 1536, 3), dtype=np.uint8)
+    page = _preview_thumbnails({
+        'page_number': 1,
+        'original_image': original,
+        'original_size': (3000, 4000),
+        'processed_image': processed,
+        'was_resized': True,
+        'fragments': [],
+    })
+
+    assert 'original_image' not in page and 'processed_image' not in page
+    assert max(page['original_thumb'].shape[:2]) == PREVIEW_MAX_DIM
+    assert max(page['processed_thumb'].shape[:2]) == PREVIEW_MAX_DIM
+    assert page['processed_scale'] == PREVIEW_MAX_DIM / 2048
+    assert page['original_size'] == (3000, 4000)
+    assert page['processed_size'] == (1536, 2048)
+
+def test_dedupe_uploads_drops_identical_repeats_only():
+    """Test that a file added twice is kept once while same-named variants survive."""
+    from io import BytesIO
+    from frontend.app import _dedupe_uploads
+
+    def uploaded(name, data):
+        f = BytesIO(data)
+        f.name, f.size = name, len(data)
+        return f
+
+    first = uploaded("a.jpg", b"aaaa")
+    repeat = uploaded("a.jpg", b"aaaa")
+    edited = uploaded("a.jpg", b"bbbb")
+    other = uploaded("b.jpg", b"aaaa")
+
+    assert _dedupe_uploads([first, repeat, edited, other]) == [first, edited, other]
+
+def test_upload_files_falls_back_to_lookup_when_listing_fails(monkeypatch):
+    """Test that a failed volume listing leaves each upload to check existence itself."""
+    from io import BytesIO
+    from unittest.mock import MagicMock
+    import frontend.app as app
+
+    monkeypatch.setattr(app, "st", MagicMock())
+    monkeypatch.setattr(app, "_invalidate_volume_listing", MagicMock())
+    file_store = MagicMock()
+    file_store.list_files_iter.side_effect = RuntimeError("listing failed")
+    file_store.upload_bytes.return_value = True
+
+    uploaded_file = BytesIO(b"test content")
+    uploaded_file.name = "test.txt"
+
+    assert app.upload_files([uploaded_file], file_store, overwrite=False) == 1
+    assert file_store.upload_bytes.call_args.kwargs["assume_exists"] is None
+
+def test_pdf_preview_lock_is_shared_across_calls():
+    """Test that every PDF preview serializes on the same lock."""
+    from frontend.app import _pdf_preview_lock
+
+    assert _pdf_preview_lock() is _pdf_preview_lock()
+
+def test_invalidated_volume_listing_marks_prefetch_stale():
+    """Test that invalidating the listing refetches it and outdates earlier fetches."""
+    from types import SimpleNamespace
+    import frontend.app as app
+
+    listings = iter([["a.jpg"], ["a.jpg", "b.jpg"]])
+    file_store = SimpleNamespace(
+        volume=SimpleNamespace(get_volume_path=lambda: "/Volumes/test/listing"),
+        list_files=lambda: next(listings),
+    )
+
+    prefetched_generation, prefetched = app._fetch_volume_listing(file_store)
+    app._invalidate_volume_listing()
+    generation, files = app._fetch_volume_listing(file_store)
+
+    assert prefetched == ["a.jpg"]
+    assert generation != prefetched_generation
+    assert files == ["a.jpg", "b.jpg"]
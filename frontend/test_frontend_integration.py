@@ -1,16 +1,10 @@
 """
 Basic tests for the frontend app functionality.
 """
-import sys
-import tempfile
-from pathlib import Path
 import cv2
 import numpy as np
 from unittest.mock import Mock
 
-# Add the parent directory to sys.path to import backend modules
-sys.path.append(str(Path(__file__).parent.parent))
-
 from backend.config import set_config_for_test
 
 
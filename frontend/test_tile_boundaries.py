@@ -1,62 +1,61 @@
-#!/usr/bin/env python3
-"""Test script for tile boundary visualization functionality."""
+"""Tests for tile boundary visualization functionality."""
 
+from collections import namedtuple
 import numpy as np
-import cv2
-import sys
-from pathlib import Path
-
-# Add the parent directory to sys.path to import backend modules
-sys.path.append(str(Path(__file__).parent.parent))
+import pytest
 
 from frontend.app import draw_tile_boundaries
 
 
-class MockFragment:
-    """Mock fragment for testing."""
-    def __init__(self, bbox):
-        self.bbox = bbox
-
-
-def test_draw_tile_boundaries():
-    """Test the draw_tile_boundaries function."""
-    
-    # Create test image
-    test_image = np.ones((200, 300, 3), dtype=np.uint8) * 255  # White image
-    
-    # Test with empty fragments
-    result = draw_tile_boundaries(test_image, [])
-    assert result.shape == test_image.shape
-    assert np.array_equal(result, test_image)  # Should be unchanged
-    print("✅ Empty fragments test passed")
-    
-    # Test with one fragment
-    fragments = [MockFragment([10, 10, 50, 50])]
-    result = draw_tile_boundaries(test_image, fragments)
-    assert result.shape == test_image.shape
-    # Check that the image is modified (boundary drawn)
-    assert not np.array_equal(result, test_image)
-    print("✅ Single fragment test passed")
-    
-    # Test with multiple fragments
-    fragments = [
-        MockFragment([0, 0, 100, 100]),
-        MockFragment([100, 0, 200, 100]),
-        MockFragment([0, 100, 100, 200]),
-        MockFragment([100, 100, 200, 200])
-    ]
-    result = draw_tile_boundaries(test_image, fragments)
-    assert result.shape == test_image.shape
-    print("✅ Multiple fragments test passed")
-    
-    # Test edge case: fragment at image boundary
-    fragments = [MockFragment([0, 0, 300, 200])]  # Full image
-    result = draw_tile_boundaries(test_image, fragments)
-    assert result.shape == test_image.shape
-    print("✅ Boundary fragment test passed")
-    
-    print("\n🎉 All tile boundary tests passed!")
-
-
-if __name__ == "__main__":
-    test_draw_tile_boundaries()
\ No newline at end of file
+# Mock fragment for testing; draw_tile_boundaries only reads .bbox
+MockFragment = namedtuple("MockFragment", ["bbox"])
+
+
+@pytest.fixture(scope="session")
+def base_image():
+    """White test image; draw_tile_boundaries never modifies its input, so it is shared."""
+    return np.full((200, 300, 3), 255, dtype=np.uint8)
+
+
+@pytest.mark.parametrize(
+    "bboxes, expect_changed",
+    [
+        pytest.param([], False, id="empty"),
+        pytest.param([(10, 10, 50, 50)], True, id="single"),
+        pytest.param(
+            [(0, 0, 100, 100), (100, 0, 200, 100), (0, 100, 100, 200), (100, 100, 200, 200)],
+            True,
+            id="multiple",
+        ),
+        pytest.param([(0, 0, 300, 200)], True, id="full-image"),  # Fragment at image boundary
+        pytest.param([(50, 50, 50, 120), (40, 70, 90, 70)], False, id="zero-area"),
+        pytest.param([(300, 0, 400, 200), (0, 250, 300, 300)], False, id="outside-image"),
+    ],
+)
+def test_draw_tile_boundaries(base_image, bboxes, expect_changed):
+    """Test the draw_tile_boundaries function with bboxes as one (N, 4) array, as the preview passes them."""
+    result = draw_tile_boundaries(base_image, np.array(bboxes, dtype=np.int32).reshape(-1, 4))
+
+    assert result.shape == base_image.shape
+    assert np.array_equal(result, base_image) != expect_changed
+    assert (base_image == 255).all()  # Input is left untouched
+
+
+def test_draw_tile_boundaries_accepts_bbox_array(base_image):
+    """Test that a list of fragment objects draws the same as the equivalent bbox array."""
+    bboxes = [(0, 0, 100, 100), (100, 0, 200, 100)]
+    from_objects = draw_tile_boundaries(base_image, [MockFragment(bbox) for bbox in bboxes])
+    from_array = draw_tile_boundaries(base_image, np.array(bboxes, dtype=np.int32))
+
+    assert np.array_equal(from_array, from_objects)
+
+
+def test_paint_tile_boundaries_draws_in_place(base_image):
+    """Test that the in-place painter matches draw_tile_boundaries on the caller's buffer."""
+    from frontend.app import paint_tile_boundaries
+
+    fragments = [MockFragment((10, 10, 50, 50))]
+    canvas = base_image.copy()
+    assert paint_tile_boundaries(canvas, fragments) is None
+
+    assert np.array_equal(canvas, draw_tile_boundaries(base_image, fragments))